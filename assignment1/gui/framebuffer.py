@@ -0,0 +1,26 @@
+import numpy as np
+from gui.state import LineModel
+
+
+def hex_to_rgb(color: str) -> tuple[int, int, int]:
+    """'#RRGGBB' -> (r, g, b)."""
+    color = color.lstrip("#")
+    return int(color[0:2], 16), int(color[2:4], 16), int(color[4:6], 16)
+
+
+def render_framebuffer(state: LineModel) -> np.ndarray:
+    """
+    Rasterize the model into an (height, width, 3) uint8 array the way
+    PixelFrame.redraw fills its PhotoImage: background, then the line pixels.
+    Used as the renderer for headless session replays.
+    """
+    fb = np.empty((state.height, state.width, 3), dtype=np.uint8)
+    fb[:] = hex_to_rgb(state.bg_color)
+
+    if state.active_pixels:
+        xy = np.array([(p.x, p.y) for p in state.active_pixels])
+        cols = xy[:, 0] + state.width // 2
+        rows = state.height // 2 - xy[:, 1]
+        visible = (cols >= 0) & (cols < state.width) & (rows >= 0) & (rows < state.height)
+        fb[rows[visible], cols[visible]] = hex_to_rgb(state.line_color)
+    return fb
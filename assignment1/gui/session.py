@@ -0,0 +1,50 @@
+"""
+Session recording and replay for LineModel.
+
+The recorder and replayer are shared with assignment2 (common/session.py,
+made importable by main.py); this module lists the LineModel setters to
+record and encodes the model's own argument types (Point, LineAlgorithm).
+"""
+
+from geometry.primitives import LineAlgorithm, Point
+
+from common import session as _session
+
+# LineModel methods that mutate state
+RECORDED_METHODS = (
+    "set_start_point",
+    "set_end_point",
+    "set_algorithm",
+    "draw_line",
+    "set_active_pixels",
+    "set_line_color",
+    "set_bg_color",
+    "set_size",
+    "set_grid_size",
+)
+
+
+def encode(value):
+    if isinstance(value, Point):
+        return {"__point__": [int(value.x), int(value.y)]}
+    if isinstance(value, LineAlgorithm):
+        return {"__algorithm__": value.name}
+    return None
+
+
+def decode(value, model):
+    if "__point__" in value:
+        return Point(*value["__point__"])
+    if "__algorithm__" in value:
+        return LineAlgorithm[value["__algorithm__"]]
+    return None
+
+
+class SessionRecorder(_session.SessionRecorder):
+    def __init__(self, model, methods=RECORDED_METHODS):
+        super().__init__(model, methods, encode)
+
+
+class SessionReplayer(_session.SessionReplayer):
+    def __init__(self, model, events: list[dict]):
+        super().__init__(model, events, decode)
@@ -0,0 +1,168 @@
+"""
+batch.py
+Apply a script of transformations to the trapezoid without the GUI.
+
+Every line holds one operation with the same parameters the sidebar exposes
+('#' starts a comment):
+
+    translate dx=2 dy=-1
+    rotate angle=30 ccw=true
+    scale sx=1.5 sy=0.5
+    shear shx=10 shy=0
+    reflect m=1 t=0
+    reflect_x
+    reset
+
+Consecutive operations are pre-composed into a single matrix, so the figure
+is only rasterized once at the end (or once per step with --frames).
+
+Usage:
+    python batch.py script.txt [--frames DIR] [--save result.json] [--check result.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import numpy as np
+from PIL import Image
+
+from geometry import transforms
+from gui.framebuffer import render_framebuffer
+from gui.state import StateModel
+
+# operation name -> (matrix builder, default parameters)
+OPERATIONS = {
+    "translate": (transforms.translation, {"dx": 0.0, "dy": 0.0}),
+    "rotate": (transforms.rotation, {"angle": 0.0, "ccw": False}),
+    "scale": (transforms.scaling, {"sx": 1.0, "sy": 1.0}),
+    "shear": (transforms.shear, {"shx": 0.0, "shy": 0.0}),
+    "reflect": (transforms.reflection, {"m": 0.0, "t": 0.0}),
+    "reflect_x": (transforms.reflection_x, {}),
+    "reset": (None, {}),
+}
+
+
+def parse_script(lines) -> list[tuple[str, dict]]:
+    """Parse script lines into (operation, parameters) tuples."""
+    ops = []
+    for lineno, line in enumerate(lines, start=1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        name, *args = line.split()
+        if name not in OPERATIONS:
+            raise ValueError(f"line {lineno}: unknown operation '{name}'")
+
+        params = dict(OPERATIONS[name][1])
+        for arg in args:
+            key, sep, value = arg.partition("=")
+            if not sep or key not in params:
+                raise ValueError(f"line {lineno}: invalid parameter '{arg}' for '{name}'")
+            if isinstance(params[key], bool):
+                params[key] = value.lower() in ("1", "true", "yes", "on")
+            else:
+                params[key] = float(value)
+        ops.append((name, params))
+    return ops
+
+
+def operation_matrix(name: str, params: dict) -> np.ndarray | None:
+    """3x3 matrix of one operation (None for reset)."""
+    builder = OPERATIONS[name][0]
+    return None if builder is None else builder(**params)
+
+
+def apply_operation(M: np.ndarray, name: str, params: dict) -> np.ndarray:
+    """Matrix after one more operation (a reset restarts from identity)."""
+    step = operation_matrix(name, params)
+    return np.eye(3) if step is None else step @ M
+
+
+def compose(ops, start: np.ndarray | None = None) -> np.ndarray:
+    """Pre-compose a whole script, starting from `start` (default identity), into the final matrix."""
+    M = np.eye(3) if start is None else start
+    for name, params in ops:
+        M = apply_operation(M, name, params)
+    return M
+
+
+def save_frame(state: StateModel, path: str) -> None:
+    """Write the current canvas, zoomed by the canvas scale, as an image."""
+    fb = render_framebuffer(state)
+    s = state.canvas_scale
+    Image.fromarray(fb.repeat(s, axis=0).repeat(s, axis=1)).save(path)
+
+
+def run_batch(state: StateModel, ops, frames_dir: str | None = None) -> None:
+    """
+    Apply the operations to the state.
+
+    Without frames the script collapses into one matrix and the figure is
+    rasterized once. With frames_dir, the running product is updated per step
+    and one numbered frame is written for the initial state and every step.
+    """
+    if frames_dir is None:
+        state.set_matrix(compose(ops, state.transformation_matrix))
+        return
+
+    os.makedirs(frames_dir, exist_ok=True)
+    save_frame(state, os.path.join(frames_dir, "frame_00000.png"))
+    M = state.transformation_matrix
+    for i, (name, params) in enumerate(ops, start=1):
+        M = apply_operation(M, name, params)
+        state.set_matrix(M)
+        save_frame(state, os.path.join(frames_dir, f"frame_{i:05d}.png"))
+
+
+def result_summary(state: StateModel) -> dict:
+    """Final matrix and transformed corners, used for regression checks."""
+    corners = state.original_trapezoid.transformed(state.transformation_matrix).corners
+    return {
+        "matrix": state.transformation_matrix.tolist(),
+        "corners": [[p.x, p.y] for p in corners],
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Apply a transformation script without the GUI.")
+    parser.add_argument("script", help="script file with one operation per line")
+    parser.add_argument("--frames", metavar="DIR", help="write one image per step into DIR")
+    parser.add_argument("--save", metavar="JSON", help="store final matrix and corners")
+    parser.add_argument("--check", metavar="JSON", help="compare final matrix and corners with a stored result")
+    parser.add_argument("--size", nargs=2, type=int, default=(30, 30), metavar=("W", "H"))
+    parser.add_argument("--scale", type=int, default=20, help="pixel size of written frames")
+    args = parser.parse_args(argv)
+
+    with open(args.script) as f:
+        ops = parse_script(f)
+
+    state = StateModel(*args.size)
+    state.set_grid_size(args.scale)
+    run_batch(state, ops, frames_dir=args.frames)
+
+    summary = result_summary(state)
+    print(f"Applied {len(ops)} operations")
+    for row in state.transformation_matrix:
+        print(f"{row[0]:9.4f} {row[1]:9.4f} {row[2]:9.4f}")
+    print("Corners:", ", ".join(f"({x}, {y})" for x, y in summary["corners"]))
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(summary, f, indent=2)
+        print("Saved:", args.save)
+
+    if args.check:
+        with open(args.check) as f:
+            expected = json.load(f)
+        same = (
+            np.allclose(summary["matrix"], expected["matrix"], atol=1e-9)
+            and summary["corners"] == expected["corners"]
+        )
+        print("Check:", "OK" if same else "MISMATCH")
+        return 0 if same else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
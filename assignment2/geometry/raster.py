@@ -0,0 +1,100 @@
+import numpy as np
+from PIL import Image
+
+
+def load_image(path: str) -> np.ndarray:
+    """Load an image file as an (H, W, 3) uint8 RGB array."""
+    with Image.open(path) as img:
+        return np.asarray(img.convert("RGB"), dtype=np.uint8)
+
+
+def image_to_logical(width: int, height: int, cols, rows):
+    """Image pixel indices (top-left origin) -> centered logical coordinates (y up)."""
+    return cols - (width // 2), (height // 2) - rows
+
+
+def logical_to_image(width: int, height: int, xs, ys):
+    """Centered logical coordinates (y up) -> image pixel indices (top-left origin)."""
+    return xs + (width // 2), (height // 2) - ys
+
+
+def warp_image(
+    image: np.ndarray, matrix: np.ndarray, interpolation: str = "bilinear", fill=0,
+    clip: tuple[int, int, int, int] | None = None,
+) -> tuple[np.ndarray, tuple[int, int]]:
+    """
+    Apply a 3x3 affine matrix to a raster via inverse mapping.
+
+    The image is placed in the same centered logical coordinate system as the
+    figure, so the StateModel transformation matrix can be used directly.
+    Only the bounding box of the transformed image is computed: for every
+    destination pixel in it, the inverse matrix gives the source position,
+    which is sampled with "nearest" or "bilinear" interpolation.
+
+    clip: optional logical rectangle (x_min, x_max, y_min, y_max), inclusive,
+    e.g. the visible canvas; the bounding box is cut down to it first, so
+    pixels outside it are never computed.
+
+    Returns the warped image and the logical (x, y) of its top-left pixel.
+    """
+    if interpolation not in ("nearest", "bilinear"):
+        raise ValueError(f"Unknown interpolation: {interpolation}")
+    try:
+        inverse = np.linalg.inv(matrix)
+    except np.linalg.LinAlgError:
+        raise ValueError("Transformation matrix is singular, cannot warp image")
+
+    src = np.asarray(image)
+    h, w = src.shape[:2]
+
+    # Destination bounding box from the transformed outer pixel edges
+    edge_cols = np.array([-0.5, w - 0.5, w - 0.5, -0.5])
+    edge_rows = np.array([-0.5, -0.5, h - 0.5, h - 0.5])
+    cx, cy = image_to_logical(w, h, edge_cols, edge_rows)
+    corners = matrix @ np.vstack([cx, cy, np.ones(4)])
+    x_min, x_max = int(np.ceil(corners[0].min())), int(np.floor(corners[0].max()))
+    y_min, y_max = int(np.ceil(corners[1].min())), int(np.floor(corners[1].max()))
+    if clip is not None:
+        x_min, x_max = max(x_min, clip[0]), min(x_max, clip[1])
+        y_min, y_max = max(y_min, clip[2]), min(y_max, clip[3])
+
+    out_shape = (max(y_max - y_min + 1, 0), max(x_max - x_min + 1, 0)) + src.shape[2:]
+    out = np.full(out_shape, fill, dtype=src.dtype)
+    if out.size == 0:
+        return out, (x_min, y_max)
+
+    # Inverse-map every destination pixel (rows top to bottom -> y decreasing)
+    X, Y = np.meshgrid(
+        np.arange(x_min, x_max + 1, dtype=np.float64),
+        np.arange(y_max, y_min - 1, -1, dtype=np.float64),
+    )
+    sx = inverse[0, 0] * X + inverse[0, 1] * Y + inverse[0, 2]
+    sy = inverse[1, 0] * X + inverse[1, 1] * Y + inverse[1, 2]
+    cols, rows = logical_to_image(w, h, sx, sy)
+
+    inside = (cols > -0.5) & (cols < w - 0.5) & (rows > -0.5) & (rows < h - 0.5)
+    cols, rows = cols[inside], rows[inside]
+
+    if interpolation == "nearest":
+        ci = np.clip(np.rint(cols).astype(np.intp), 0, w - 1)
+        ri = np.clip(np.rint(rows).astype(np.intp), 0, h - 1)
+        out[inside] = src[ri, ci]
+        return out, (x_min, y_max)
+
+    # Bilinear: blend the four neighbours, clamping at the image border
+    c0 = np.floor(cols).astype(np.intp)
+    r0 = np.floor(rows).astype(np.intp)
+    fc = cols - c0
+    fr = rows - r0
+    c0c, c1c = np.clip(c0, 0, w - 1), np.clip(c0 + 1, 0, w - 1)
+    r0c, r1c = np.clip(r0, 0, h - 1), np.clip(r0 + 1, 0, h - 1)
+    if src.ndim == 3:
+        fc, fr = fc[:, None], fr[:, None]
+
+    top = src[r0c, c0c] * (1 - fc) + src[r0c, c1c] * fc
+    bottom = src[r1c, c0c] * (1 - fc) + src[r1c, c1c] * fc
+    blended = top * (1 - fr) + bottom * fr
+    if np.issubdtype(src.dtype, np.integer):
+        blended = np.rint(blended)
+    out[inside] = blended.astype(src.dtype)
+    return out, (x_min, y_max)
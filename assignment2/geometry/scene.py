@@ -0,0 +1,142 @@
+import numpy as np
+from geometry.primitives import Point, Trapezoid
+
+
+class SceneNode:
+    """Node of a scene graph: a local 3x3 matrix, child nodes and an optional shape."""
+
+    def __init__(self, name: str, shape: Trapezoid | None = None, local_matrix: np.ndarray | None = None):
+        self.name = name
+        self.shape = shape
+        self.local_matrix = np.eye(3) if local_matrix is None else np.asarray(local_matrix, dtype=float)
+
+        self.parent: "SceneNode | None" = None
+        self.children: list["SceneNode"] = []
+
+        # Cached world matrix (parent world @ local), valid while not dirty
+        self.world_matrix = self.local_matrix.copy()
+        # dirty: own world matrix (and the whole subtree) must be recomputed
+        # child_dirty: some descendant is dirty, descend during update
+        self.dirty = True
+        self.child_dirty = False
+
+        # Leaf caches, refreshed by SceneGraph.update()
+        if shape is not None:
+            self.local_corners = np.array([p.coords for p in shape.corners], dtype=float)
+        else:
+            self.local_corners = np.empty((0, 3))
+        self.world_corners = self.local_corners.copy()
+        self._pixels: list[Point] | None = None
+
+    def __repr__(self):
+        return f"SceneNode({self.name!r}, children={len(self.children)})"
+
+    def add_child(self, node: "SceneNode") -> "SceneNode":
+        node.parent = self
+        self.children.append(node)
+        node.mark_dirty()
+        return node
+
+    def set_local_matrix(self, matrix: np.ndarray) -> None:
+        self.local_matrix = np.asarray(matrix, dtype=float)
+        self.mark_dirty()
+
+    def apply_matrix(self, matrix: np.ndarray) -> None:
+        """Left-multiply a matrix into the local transform (same convention as StateModel)."""
+        self.set_local_matrix(matrix @ self.local_matrix)
+
+    def mark_dirty(self) -> None:
+        """Invalidate this subtree and flag the path to the root, stopping at already flagged nodes."""
+        self.dirty = True
+        node = self.parent
+        while node is not None and not node.child_dirty:
+            node.child_dirty = True
+            node = node.parent
+
+    @property
+    def pixels(self) -> list[Point]:
+        """Rasterized outline of the transformed shape (cached until the node changes)."""
+        if self.shape is None:
+            return []
+        if self._pixels is None:
+            corners = [Point(int(x), int(y)) for x, y in np.rint(self.world_corners[:, :2])]
+            self._pixels = type(self.shape)(*corners).active_pixels
+        return self._pixels
+
+    def iter_subtree(self):
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+
+class SceneGraph:
+    """
+    Hierarchy of transformed shapes.
+
+    World matrices are cached per node and only recomputed for dirty subtrees;
+    the corners of every leaf below a changed node are re-transformed together
+    in a single batched matrix multiply.
+    """
+
+    def __init__(self):
+        self.root = SceneNode("root")
+        self._pixels: list[Point] | None = None
+
+    def find(self, name: str) -> SceneNode | None:
+        for node in self.root.iter_subtree():
+            if node.name == name:
+                return node
+        return None
+
+    def update(self) -> list[SceneNode]:
+        """Refresh cached world matrices and leaf geometry. Returns the leaves that changed."""
+        changed: list[SceneNode] = []
+
+        # Parents are popped before their children, so their world matrix is already fresh
+        stack = [(self.root, False)]
+        while stack:
+            node, force = stack.pop()
+            if not (force or node.dirty or node.child_dirty):
+                continue
+
+            recompute = force or node.dirty
+            if recompute:
+                parent_world = node.parent.world_matrix if node.parent is not None else np.eye(3)
+                node.world_matrix = parent_world @ node.local_matrix
+                node.dirty = False
+                if node.shape is not None:
+                    changed.append(node)
+            node.child_dirty = False
+            stack.extend((child, recompute) for child in node.children)
+
+        if changed:
+            self._transform_leaves(changed)
+            self._pixels = None
+        return changed
+
+    @staticmethod
+    def _transform_leaves(leaves: list[SceneNode]) -> None:
+        """Apply each leaf's world matrix to its corners in one batched multiply."""
+        counts = [len(leaf.local_corners) for leaf in leaves]
+        points = np.concatenate([leaf.local_corners for leaf in leaves])
+        worlds = np.stack([leaf.world_matrix for leaf in leaves])
+        owner = np.repeat(np.arange(len(leaves)), counts)
+
+        transformed = np.einsum("nij,nj->ni", worlds[owner], points)
+
+        for leaf, corners in zip(leaves, np.split(transformed, np.cumsum(counts)[:-1])):
+            leaf.world_corners = corners
+            leaf._pixels = None
+
+    @property
+    def active_pixels(self) -> list[Point]:
+        """All leaf pixels of the scene, after bringing dirty subtrees up to date."""
+        self.update()
+        if self._pixels is None:
+            pixels = []
+            for node in self.root.iter_subtree():
+                pixels.extend(node.pixels)
+            self._pixels = pixels
+        return self._pixels
@@ -0,0 +1,55 @@
+import numpy as np
+
+
+def translation(dx: float, dy: float) -> np.ndarray:
+    return np.array([[1, 0, dx], [0, 1, dy], [0, 0, 1]], dtype=float)
+
+
+def rotation(angle: float, ccw: bool = False) -> np.ndarray:
+    """Rotation by `angle` degrees, clockwise unless ccw is set (as in the sidebar)."""
+    if not ccw:
+        angle = -angle
+    a = np.deg2rad(angle)
+    return np.array([[np.cos(a), -np.sin(a), 0], [np.sin(a), np.cos(a), 0], [0, 0, 1]])
+
+
+def scaling(sx: float, sy: float) -> np.ndarray:
+    return np.array([[sx, 0, 0], [0, sy, 0], [0, 0, 1]], dtype=float)
+
+
+def shear(shx: float, shy: float) -> np.ndarray:
+    """Shear with angles in degrees (converted to tangents)."""
+    shx, shy = np.deg2rad(shx), np.deg2rad(shy)
+    return np.array([[1, np.tan(shx), 0], [np.tan(shy), 1, 0], [0, 0, 1]])
+
+
+def reflection(m: float, t: float) -> np.ndarray:
+    """Reflection across the line y = m*x + t."""
+    theta = np.arctan(m)
+    c, s = np.cos(theta), np.sin(theta)
+
+    T1 = np.array([[1, 0, 0], [0, 1, -t], [0, 0, 1]])
+
+    R1 = np.array([[c, s, 0], [-s, c, 0], [0, 0, 1]])
+
+    RefX = np.array([[1, 0, 0], [0, -1, 0], [0, 0, 1]])
+
+    R2 = np.linalg.inv(R1)
+    T2 = np.linalg.inv(T1)
+
+    return T2 @ R2 @ RefX @ R1 @ T1
+
+
+def reflection_x() -> np.ndarray:
+    """
+    Reflection across the vertical axis x = 0.
+    Matrix form:
+        [ -1   0   0 ]
+        [  0   1   0 ]
+        [  0   0   1 ]
+    """
+    return np.array([
+        [-1,  0, 0],
+        [ 0,  1, 0],
+        [ 0,  0, 1],
+    ], dtype=float)
@@ -0,0 +1,65 @@
+import numpy as np
+from geometry.raster import warp_image
+from gui.state import StateModel
+
+_HEX = np.array([f"{i:02x}" for i in range(256)])
+
+
+def hex_to_rgb(color: str) -> tuple[int, int, int]:
+    """'#RRGGBB' -> (r, g, b)."""
+    color = color.lstrip("#")
+    return int(color[0:2], 16), int(color[2:4], 16), int(color[4:6], 16)
+
+
+def render_framebuffer(state: StateModel) -> np.ndarray:
+    """
+    Rasterize the current state into an (height, width, 3) uint8 array:
+    background, then the warped texture (if any), then the figure outline.
+    """
+    fb = np.empty((state.height, state.width, 3), dtype=np.uint8)
+    fb[:] = hex_to_rgb(state.bg_color)
+
+    if state.texture is not None:
+        _draw_texture(fb, state)
+
+    if state.active_pixels:
+        xy = np.array([(p.x, p.y) for p in state.active_pixels])
+        cols = xy[:, 0] + state.width // 2
+        rows = state.height // 2 - xy[:, 1]
+        visible = (cols >= 0) & (cols < state.width) & (rows >= 0) & (rows < state.height)
+        fb[rows[visible], cols[visible]] = hex_to_rgb(state.line_color)
+    return fb
+
+
+def _draw_texture(fb: np.ndarray, state: StateModel) -> None:
+    """Warp the texture with the transformation matrix and alpha-blend it into fb."""
+    tex = state.texture
+    rgba = np.concatenate([tex, np.full(tex.shape[:2] + (1,), 255, dtype=np.uint8)], axis=2)
+    # only the part of the warped texture that lands on the canvas
+    x_lo, y_hi = -(state.width // 2), state.height // 2
+    canvas = (x_lo, x_lo + state.width - 1, y_hi - state.height + 1, y_hi)
+    try:
+        warped, (x0, y0) = warp_image(rgba, state.transformation_matrix, state.interpolation,
+                                      clip=canvas)
+    except ValueError:
+        return  # singular matrix (e.g. scale 0): the texture collapses, skip it
+
+    # top-left of the warped image in framebuffer pixels, clipped to the canvas
+    col0 = x0 + state.width // 2
+    row0 = state.height // 2 - y0
+    h, w = warped.shape[:2]
+    c_start, r_start = max(col0, 0), max(row0, 0)
+    c_end, r_end = min(col0 + w, state.width), min(row0 + h, state.height)
+    if c_start >= c_end or r_start >= r_end:
+        return
+
+    patch = warped[r_start - row0:r_end - row0, c_start - col0:c_end - col0]
+    alpha = patch[..., 3:].astype(np.float64) / 255.0
+    target = fb[r_start:r_end, c_start:c_end]
+    target[:] = np.rint(patch[..., :3] * alpha + target * (1 - alpha)).astype(np.uint8)
+
+
+def photo_data(fb: np.ndarray) -> str:
+    """Encode an RGB array as the row string accepted by tk.PhotoImage.put()."""
+    hexed = np.char.add(np.char.add(np.char.add("#", _HEX[fb[..., 0]]), _HEX[fb[..., 1]]), _HEX[fb[..., 2]])
+    return " ".join("{" + " ".join(row) + "}" for row in hexed)
@@ -1,11 +1,30 @@
 import tkinter as tk
+from gui.framebuffer import photo_data, render_framebuffer
 from gui.state import StateModel
+from gui.tiles import TileCache, TileVersions
+
+# Tile edge in logical pixels
+TILE_SIZE = 32
+
+
+def _wheel_units(delta: int) -> int:
+    """Scroll units for a <MouseWheel> delta: multiples of 120 on Windows, small values on macOS."""
+    if delta == 0:
+        return 0
+    return -round(delta / 120) or (-1 if delta > 0 else 1)
 
 
 class PixelFrame(tk.Frame):
-    """Canvas view that renders logical coordinates as a pixel grid."""
+    """
+    Canvas view that renders logical coordinates as a pixel grid.
 
-    def __init__(self, parent, state: StateModel, width=20, height=20, scale=20, **kwargs):
+    The zoomed image is split into tiles; only tiles intersecting the visible
+    viewport are zoomed and uploaded. Tiles are cached by content version and
+    evicted least-recently-used once the cache exceeds `cache_bytes`.
+    """
+
+    def __init__(self, parent, state: StateModel, width=20, height=20, scale=20,
+                 cache_bytes=64 * 1024 * 1024, **kwargs):
         super().__init__(parent, **kwargs)
         self.state = state
         self.state.subscribe(self.redraw)
@@ -14,37 +33,108 @@ class PixelFrame(tk.Frame):
         self.height = height
         self.scale = scale
 
-        self.img = tk.PhotoImage(width=self.width, height=self.height)
-        self.img_big = self.img.zoom(self.scale)
+        self.canvas = tk.Canvas(self, highlightthickness=0, bg=kwargs.get("bg", "white"))
+        xbar = tk.Scrollbar(self, orient="horizontal", command=self.canvas.xview)
+        ybar = tk.Scrollbar(self, orient="vertical", command=self.canvas.yview)
+        self.canvas.configure(
+            xscrollcommand=lambda *args: self._on_scroll(xbar, *args),
+            yscrollcommand=lambda *args: self._on_scroll(ybar, *args),
+        )
+        ybar.pack(side="right", fill="y")
+        xbar.pack(side="bottom", fill="x")
+        self.canvas.pack(side="left", fill="both", expand=True)
+
+        # Panning: drag with the middle mouse button, scroll with the wheel
+        self.canvas.bind("<ButtonPress-2>", lambda e: self.canvas.scan_mark(e.x, e.y))
+        self.canvas.bind("<B2-Motion>", lambda e: self.canvas.scan_dragto(e.x, e.y, gain=1))
+        self.canvas.bind("<MouseWheel>", lambda e: self.canvas.yview_scroll(_wheel_units(e.delta), "units"))
+        self.canvas.bind("<Shift-MouseWheel>", lambda e: self.canvas.xview_scroll(_wheel_units(e.delta), "units"))
+        # X11 reports the wheel as buttons 4 (up) and 5 (down) instead of <MouseWheel>
+        self.canvas.bind("<Button-4>", lambda e: self.canvas.yview_scroll(-1, "units"))
+        self.canvas.bind("<Button-5>", lambda e: self.canvas.yview_scroll(1, "units"))
+        self.canvas.bind("<Shift-Button-4>", lambda e: self.canvas.xview_scroll(-1, "units"))
+        self.canvas.bind("<Shift-Button-5>", lambda e: self.canvas.xview_scroll(1, "units"))
+        self.canvas.bind("<Configure>", lambda e: self._schedule_viewport_update())
+
+        self._framebuffer = None
+        self._versions = TileVersions(TILE_SIZE)
+        self._cache = TileCache(cache_bytes)
+        self._items: dict[tuple[int, int], tuple[int, tuple]] = {}  # tile -> (canvas item, cache key)
+        self._update_pending = False
 
-        self.label = tk.Label(self, image=self.img_big)
-        self.label.pack()
+        self.redraw()
 
     def redraw(self) -> None:
-        """Rebuild image based on model state."""
+        """Rebuild the framebuffer from model state and refresh the visible tiles."""
         # get size from state
         self.width = self.state.width
         self.height = self.state.height
         self.scale = self.state.canvas_scale
 
-        self.img = tk.PhotoImage(width=self.width, height=self.height)
+        self._framebuffer = render_framebuffer(self.state)
+        self._versions.update(self._framebuffer)
+        self.canvas.configure(scrollregion=(0, 0, self.width * self.scale, self.height * self.scale))
+        self._update_viewport()
+
+    def _on_scroll(self, bar: tk.Scrollbar, first, last) -> None:
+        bar.set(first, last)
+        self._schedule_viewport_update()
+
+    def _schedule_viewport_update(self) -> None:
+        if not self._update_pending:
+            self._update_pending = True
+            self.after_idle(self._update_viewport)
+
+    def _update_viewport(self) -> None:
+        """Show the tiles intersecting the viewport and drop canvas items for all others."""
+        self._update_pending = False
+        if self._framebuffer is None:
+            return
+
+        tile_px = TILE_SIZE * self.scale
+        n_ty, n_tx = self._versions.versions.shape
+        left, top = self.canvas.canvasx(0), self.canvas.canvasy(0)
+        right = self.canvas.canvasx(self.canvas.winfo_width())
+        bottom = self.canvas.canvasy(self.canvas.winfo_height())
+        tx0, tx1 = max(int(left // tile_px), 0), min(int(right // tile_px), n_tx - 1)
+        ty0, ty1 = max(int(top // tile_px), 0), min(int(bottom // tile_px), n_ty - 1)
+
+        visible_keys = set()
+        for ty in range(ty0, ty1 + 1):
+            for tx in range(tx0, tx1 + 1):
+                key = (tx, ty, int(self._versions.versions[ty, tx]), self.scale)
+                visible_keys.add(key)
+                image = self._cache.get(key)
+                if image is None:
+                    image = self._render_tile(tx, ty, key)
+
+                item = self._items.get((tx, ty))
+                if item is None:
+                    item_id = self.canvas.create_image(tx * tile_px, ty * tile_px, anchor="nw", image=image)
+                    self._items[(tx, ty)] = (item_id, key)
+                elif item[1] != key:
+                    self.canvas.itemconfigure(item[0], image=image)
+                    self.canvas.coords(item[0], tx * tile_px, ty * tile_px)
+                    self._items[(tx, ty)] = (item[0], key)
 
-        # Background fill
-        bg = self.state.bg_color
-        for x in range(self.width):
-            for y in range(self.height):
-                self.img.put(bg, (x, y))
+        visible_tiles = {key[:2] for key in visible_keys}
+        for tile in list(self._items):
+            if tile not in visible_tiles:
+                self.canvas.delete(self._items.pop(tile)[0])
 
-        # Draw figure pixels
-        color = self.state.line_color
-        for pixel in self.state.active_pixels:
-            fx, fy = self.coords_to_frame(pixel.x, pixel.y)
-            px, py = fx // self.scale, fy // self.scale
-            if 0 <= px < self.width and 0 <= py < self.height:
-                self.img.put(color, (px, py))
+        self._cache.evict(pinned=visible_keys)
 
-        self.img_big = self.img.zoom(self.scale)
-        self.label.config(image=self.img_big)
+    def _render_tile(self, tx: int, ty: int, key: tuple) -> tk.PhotoImage:
+        """Zoom one framebuffer tile into a PhotoImage and store it in the cache."""
+        tile = self._framebuffer[
+            ty * TILE_SIZE:(ty + 1) * TILE_SIZE, tx * TILE_SIZE:(tx + 1) * TILE_SIZE
+        ]
+        h, w = tile.shape[:2]
+        small = tk.PhotoImage(width=w, height=h)
+        small.put(photo_data(tile))
+        image = small.zoom(self.scale)
+        self._cache.put(key, image, w * h * self.scale * self.scale * 4)
+        return image
 
     def coords_to_frame(self, x: int, y: int) -> tuple[int, int]:
         """Convert centered logical coordinates to frame coordinates (top-left origin)."""
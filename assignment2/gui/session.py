@@ -0,0 +1,62 @@
+"""
+Session recording and replay for StateModel.
+
+The recorder and replayer are shared with assignment1 (common/session.py,
+made importable by main.py); this module lists the StateModel methods to
+record and encodes the model's own argument types. Scene nodes are stored by name and looked up again in
+the replayed model's scene graph (node names must be unique), shapes by
+their corner coordinates.
+"""
+
+from geometry.primitives import Point, Trapezoid
+from geometry.scene import SceneNode
+
+from common import session as _session
+
+# StateModel methods that mutate state
+RECORDED_METHODS = (
+    "apply_matrix",
+    "set_matrix",
+    "reset_matrix",
+    "add_shape",
+    "apply_node_matrix",
+    "set_line_color",
+    "set_bg_color",
+    "set_texture",
+    "set_interpolation",
+    "set_size",
+    "set_grid_size",
+)
+
+
+def encode(value):
+    if isinstance(value, Point):
+        return {"__point__": [value.x, value.y]}
+    if isinstance(value, Trapezoid):
+        return {"__trapezoid__": [[p.x, p.y] for p in value.corners]}
+    if isinstance(value, SceneNode):
+        return {"__node__": value.name}
+    return None
+
+
+def decode(value, model):
+    if "__point__" in value:
+        return Point(*value["__point__"])
+    if "__trapezoid__" in value:
+        return Trapezoid(*(Point(x, y) for x, y in value["__trapezoid__"]))
+    if "__node__" in value:
+        node = model.scene.find(value["__node__"])
+        if node is None:
+            raise ValueError(f"Scene node {value['__node__']!r} not found")
+        return node
+    return None
+
+
+class SessionRecorder(_session.SessionRecorder):
+    def __init__(self, model, methods=RECORDED_METHODS):
+        super().__init__(model, methods, encode)
+
+
+class SessionReplayer(_session.SessionReplayer):
+    def __init__(self, model, events: list[dict]):
+        super().__init__(model, events, decode)
@@ -1,7 +1,10 @@
 import tkinter as tk
 import tkinter.colorchooser as colorchooser
+import tkinter.filedialog as filedialog
+from geometry import transforms
+from geometry.raster import load_image
+from gui.framebuffer import render_framebuffer
 from gui.state import StateModel
-import numpy as np
 
 
 class Sidebar(tk.Frame):
@@ -209,6 +212,27 @@ class Sidebar(tk.Frame):
             side="left"
         )
 
+        # --- Texture (raster warped with the transformation matrix) ---
+        tk.Label(self, text="Texture:").pack(pady=(10, 5))
+
+        tex_frame = tk.Frame(self)
+        tex_frame.pack(pady=2, anchor="w")
+        tk.Button(tex_frame, text="Load Image", command=self.load_texture).pack(side="left", padx=2)
+        tk.Button(tex_frame, text="From Canvas", command=self.capture_texture).pack(side="left", padx=2)
+        tk.Button(tex_frame, text="Clear", command=self.clear_texture).pack(side="left", padx=2)
+
+        interp_frame = tk.Frame(self)
+        interp_frame.pack(pady=2, anchor="w")
+        tk.Label(interp_frame, text="Sampling:").pack(side="left")
+        self.interp_var = tk.StringVar(value=self.state.interpolation)
+        tk.OptionMenu(
+            interp_frame,
+            self.interp_var,
+            "nearest",
+            "bilinear",
+            command=lambda mode: self.state.set_interpolation(mode),
+        ).pack(side="left", padx=2)
+
         # --- Color pickers ---
         tk.Label(self, text="Colors:").pack(pady=(10, 5))
 
@@ -247,66 +271,45 @@ class Sidebar(tk.Frame):
             self.state.set_bg_color(color)
             self.bg_preview.config(bg=color)
 
+    def load_texture(self) -> None:
+        path = filedialog.askopenfilename(
+            title="Choose Texture",
+            filetypes=[("Images", "*.png *.jpg *.jpeg *.bmp *.gif"), ("All files", "*.*")],
+        )
+        if path:
+            self.state.set_texture(load_image(path))
+
+    def capture_texture(self) -> None:
+        """Use the current canvas content as texture, restarting from the identity matrix."""
+        self.state.set_texture(render_framebuffer(self.state))
+        self.state.reset_matrix()
+
+    def clear_texture(self) -> None:
+        self.state.set_texture(None)
+
     def apply_translation(self):
-        dx = self.dx_var.get()
-        dy = self.dy_var.get()
-        M = np.array([[1, 0, dx], [0, 1, dy], [0, 0, 1]])
+        M = transforms.translation(self.dx_var.get(), self.dy_var.get())
         self.state.apply_matrix(M)
 
     def apply_rotation(self):
-        angle = self.rot_var.get()
-        if not self.ccw_var.get():
-            angle = -angle
-        a = np.deg2rad(angle)
-        M = np.array([[np.cos(a), -np.sin(a), 0], [np.sin(a), np.cos(a), 0], [0, 0, 1]])
+        M = transforms.rotation(self.rot_var.get(), ccw=self.ccw_var.get())
         self.state.apply_matrix(M)
 
     def apply_scaling(self) -> None:
-        sx = self.sx_var.get()
-        sy = self.sy_var.get()
-        M = np.array([[sx, 0, 0], [0, sy, 0], [0, 0, 1]])
+        M = transforms.scaling(self.sx_var.get(), self.sy_var.get())
         self.state.apply_matrix(M)
 
     def apply_shear(self) -> None:
-        shx = np.deg2rad(self.shx_var.get())
-        shy = np.deg2rad(self.shy_var.get())
-        M = np.array([[1, np.tan(shx), 0], [np.tan(shy), 1, 0], [0, 0, 1]])
+        M = transforms.shear(self.shx_var.get(), self.shy_var.get())
         self.state.apply_matrix(M)
 
     def apply_reflection(self) -> None:
-        m = self.ref_m_var.get()
-        t = self.ref_t_var.get()
-
-        theta = np.arctan(m)
-        c, s = np.cos(theta), np.sin(theta)
-
-        T1 = np.array([[1, 0, 0], [0, 1, -t], [0, 0, 1]])
-
-        R1 = np.array([[c, s, 0], [-s, c, 0], [0, 0, 1]])
-
-        RefX = np.array([[1, 0, 0], [0, -1, 0], [0, 0, 1]])
-
-        R2 = np.linalg.inv(R1)
-        T2 = np.linalg.inv(T1)
-
-        M = T2 @ R2 @ RefX @ R1 @ T1
-
+        M = transforms.reflection(self.ref_m_var.get(), self.ref_t_var.get())
         self.state.apply_matrix(M)
 
     def apply_reflection_x(self):
-        """
-        Reflect the figure across the vertical axis x = 0.
-        Matrix form:
-            [ -1   0   0 ]
-            [  0   1   0 ]
-            [  0   0   1 ]
-        """
-        M = np.array([
-            [-1,  0, 0],
-            [ 0,  1, 0],
-            [ 0,  0, 1],
-        ])
-        self.state.apply_matrix(M)
+        """Reflect the figure across the vertical axis x = 0."""
+        self.state.apply_matrix(transforms.reflection_x())
 
 
     def reset_transform(self):
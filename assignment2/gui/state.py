@@ -1,5 +1,6 @@
 import numpy as np
 from geometry.primitives import Point, Trapezoid
+from geometry.scene import SceneGraph, SceneNode
 from typing import Callable
 
 
@@ -23,12 +24,19 @@ class StateModel:
         self.line_color = "#0000FF"
         self.bg_color = "#EBEBEB"
 
+        # Optional raster warped with the same matrix as the figure (H, W, 3) uint8
+        self.texture: np.ndarray | None = None
+        self.interpolation = "bilinear"
+
         # Global transformation matrix
         self.transformation_matrix = np.eye(3)
 
+        # Scene graph: the global matrix lives on the root, shapes are leaves below it
+        self.scene = SceneGraph()
+        self.scene.root.add_child(SceneNode("trapezoid", shape=self.original_trapezoid))
+
         # Computed render pixels
-        self.active_pixels = self.original_trapezoid.active_pixels
-        self.transformation_matrix = np.eye(3)
+        self.active_pixels = self.scene.active_pixels
 
         # Subscriber callbacks (the Views)
         self._subscribers: list[Callable] = []
@@ -47,13 +55,31 @@ class StateModel:
         self.transformation_matrix = M_local @ self.transformation_matrix
         self._recompute_pixels()
 
+    def set_matrix(self, M: np.ndarray):
+        """Replace the global matrix (e.g. with a pre-composed batch of transforms)."""
+        self.transformation_matrix = np.asarray(M, dtype=float)
+        self._recompute_pixels()
+
     def reset_matrix(self):
         self.transformation_matrix = np.eye(3)
         self._recompute_pixels()
 
+    def add_shape(self, name: str, shape: Trapezoid | None = None,
+                  parent: SceneNode | None = None, local_matrix: np.ndarray | None = None) -> SceneNode:
+        """Add a shape (or an empty group when shape is None) below parent (default: root)."""
+        node = SceneNode(name, shape=shape, local_matrix=local_matrix)
+        (parent or self.scene.root).add_child(node)
+        self.set_active_pixels(self.scene.active_pixels)
+        return node
+
+    def apply_node_matrix(self, node: SceneNode, M_local: np.ndarray) -> None:
+        """Transform a single group or shape; only its subtree is recomputed."""
+        node.apply_matrix(M_local)
+        self.set_active_pixels(self.scene.active_pixels)
+
     def _recompute_pixels(self):
-        transformed = self.original_trapezoid.transformed(self.transformation_matrix)
-        self.set_active_pixels(transformed.active_pixels)
+        self.scene.root.set_local_matrix(self.transformation_matrix)
+        self.set_active_pixels(self.scene.active_pixels)
 
     # --- State mutators ---
     def update_pixels(self) -> None:
@@ -76,6 +102,14 @@ class StateModel:
         #print("DEBUG: state.bg_color: ", self.bg_color)
         self.notify()
 
+    def set_texture(self, image: np.ndarray | None) -> None:
+        self.texture = image
+        self.notify()
+
+    def set_interpolation(self, mode: str) -> None:
+        self.interpolation = mode
+        self.notify()
+
     def set_size(self, height: int, width: int) -> None:
         self.width = width
         self.height = height
@@ -0,0 +1,78 @@
+from collections import OrderedDict
+import numpy as np
+
+
+class TileVersions:
+    """
+    Content versions for the square tiles of a framebuffer.
+
+    Each update compares the new framebuffer with the previous one and only
+    bumps the version of tiles whose pixels actually changed, so cached tile
+    images stay valid across unrelated state changes.
+    """
+
+    def __init__(self, tile_size: int):
+        self.tile_size = tile_size
+        self.versions = np.zeros((0, 0), dtype=np.int64)
+        self._previous: np.ndarray | None = None
+        self._generation = 0
+
+    def grid_shape(self, height: int, width: int) -> tuple[int, int]:
+        t = self.tile_size
+        return -(-height // t), -(-width // t)
+
+    def update(self, fb: np.ndarray) -> np.ndarray:
+        """Register a new framebuffer and return the (tiles_y, tiles_x) version array."""
+        self._generation += 1
+        h, w = fb.shape[:2]
+        ny, nx = self.grid_shape(h, w)
+
+        if self._previous is None or self._previous.shape != fb.shape:
+            self.versions = np.full((ny, nx), self._generation, dtype=np.int64)
+        else:
+            changed = np.any(fb != self._previous, axis=2)
+            t = self.tile_size
+            padded = np.zeros((ny * t, nx * t), dtype=bool)
+            padded[:h, :w] = changed
+            dirty_tiles = padded.reshape(ny, t, nx, t).any(axis=(1, 3))
+            self.versions[dirty_tiles] = self._generation
+
+        self._previous = fb.copy()
+        return self.versions
+
+
+class TileCache:
+    """Least-recently-used cache of rendered tiles, bounded by an approximate byte budget."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries: OrderedDict = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, tile, nbytes: int) -> None:
+        if key in self._entries:
+            self.total_bytes -= self._entries.pop(key)[1]
+        self._entries[key] = (tile, nbytes)
+        self.total_bytes += nbytes
+
+    def evict(self, pinned=frozenset()) -> int:
+        """Drop least recently used tiles (except pinned keys) until under budget."""
+        evicted = 0
+        for key in list(self._entries):
+            if self.total_bytes <= self.max_bytes:
+                break
+            if key in pinned:
+                continue
+            self.total_bytes -= self._entries.pop(key)[1]
+            evicted += 1
+        return evicted
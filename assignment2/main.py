@@ -1,6 +1,44 @@
+import argparse
+import sys
+from pathlib import Path
+
+# the session recorder is shared by the assignments and lives in common/ at the repository root
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from common.session import load_session, print_timings
 from gui.app import App
+from gui.framebuffer import render_framebuffer
+from gui.session import SessionRecorder, SessionReplayer
+from gui.state import StateModel
+
+
+def replay_headless(path: str, realtime: bool) -> None:
+    """Replay a session without Tk; the framebuffer render stands in for the canvas."""
+    state = StateModel(30, 30)
+    state.subscribe(lambda: render_framebuffer(state))
+    print_timings(SessionReplayer(state, load_session(path)).run(realtime=realtime))
 
 
 if __name__ == "__main__":
-    app = App()
-    app.mainloop()
+    parser = argparse.ArgumentParser(description="Graphic Transformation Tool")
+    parser.add_argument("--record", metavar="FILE", help="record all state changes to FILE")
+    parser.add_argument("--replay", metavar="FILE", help="replay a recorded session and print timings")
+    parser.add_argument("--headless", action="store_true", help="replay without opening the window")
+    parser.add_argument("--realtime", action="store_true", help="keep the recorded pacing on replay")
+    args = parser.parse_args()
+
+    if args.replay and args.headless:
+        replay_headless(args.replay, args.realtime)
+    else:
+        app = App()
+        recorder = SessionRecorder(app.state) if args.record else None
+        if args.replay:
+            replayer = SessionReplayer(app.state, load_session(args.replay))
+            app.after(200, lambda: print_timings(
+                replayer.run(realtime=args.realtime, flush=app.update_idletasks)
+            ))
+        app.mainloop()
+
+        if recorder is not None:
+            recorder.save(args.record)
+            print("Saved:", args.record)
@@ -0,0 +1,102 @@
+"""
+antialias.py
+Adaptive supersampling for escape-time images.
+
+Supersampling every pixel multiplies the render time by the number of
+samples, but aliasing only shows where the smooth iteration field changes
+quickly: on the set boundary and along thin filaments. Those pixels are
+found from the differences to their four neighbours and re-sampled on a
+jittered (stratified) k x k subgrid; the colors of the samples are
+averaged. Everything else keeps its single sample.
+
+Usage:
+    python antialias.py
+"""
+
+import os
+import time
+
+import numpy as np
+from PIL import Image
+
+from escape_time import OUT_DIR, escape_points, escape_time, grid_dtype
+from palette import get_palette
+
+
+def refine_mask(nu, threshold=1.0):
+    """
+    Pixels whose smooth value differs from one of their 4-neighbours by
+    more than `threshold` iterations. Pixels next to the set (value 0)
+    always qualify, since escaped values are at least about 1.
+    """
+    padded = np.pad(nu, 1, mode="edge")
+    center = padded[1:-1, 1:-1]
+    diff = np.zeros_like(nu)
+    for neighbour in (padded[:-2, 1:-1], padded[2:, 1:-1], padded[1:-1, :-2], padded[1:-1, 2:]):
+        np.maximum(diff, np.abs(neighbour - center), out=diff)
+    return diff > threshold
+
+
+def antialias(nu, xlim, ylim, formula="mandelbrot", c=None, max_iter=500, samples=4,
+              threshold=1.0, cmap_name="plasma", mode="log", seed=0):
+    """
+    Color the smooth values `nu` (as returned by escape_time()/mandelbrot()/
+    julia() for the same xlim/ylim) and supersample the high-gradient pixels.
+
+    samples: samples per refined pixel, rounded down to a square k x k grid;
+             each sample is jittered uniformly within its cell
+    Returns (rgb, fraction): an (H, W, 3) uint8 array and the fraction of
+    pixels that were refined.
+    """
+    height, width = nu.shape
+    k = max(int(np.sqrt(samples)), 1)
+    dtype = grid_dtype(xlim, ylim, width, height, formula=formula, parameter_plane=c is None,
+                       max_iter=max_iter)
+    xs = np.linspace(xlim[0], xlim[1], width, dtype=np.float64)
+    ys = np.linspace(ylim[0], ylim[1], height, dtype=np.float64)
+    dx = (xlim[1] - xlim[0]) / max(width - 1, 1)
+    dy = (ylim[1] - ylim[0]) / max(height - 1, 1)
+
+    r, col = np.nonzero(refine_mask(nu, threshold))
+    n = r.size
+
+    # stratified jitter: one sample in each cell of a k x k grid over the pixel
+    rng = np.random.default_rng(seed)
+    cells = (np.arange(k) + 0.5) / k - 0.5
+    off_x = (np.tile(cells, k)[np.newaxis, :] + rng.uniform(-0.5, 0.5, (n, k * k)) / k) * dx
+    off_y = (np.repeat(cells, k)[np.newaxis, :] + rng.uniform(-0.5, 0.5, (n, k * k)) / k) * dy
+    points = (xs[col][:, np.newaxis] + off_x) + 1j * (ys[r][:, np.newaxis] + off_y)
+    sample_values = escape_points(points.astype(np.complex64 if dtype == np.float32 else np.complex128),
+                                  formula, c, max_iter)
+
+    # color base pixels and samples together so every palette mode sees one value set
+    palette = get_palette(cmap_name, mode)
+    idx = palette.indices(np.concatenate([nu.ravel(), sample_values.ravel()]), nu.min(), nu.max())
+    rgb = palette.lut[idx[:nu.size]].reshape(height, width, 3)
+    sample_rgb = palette.lut[idx[nu.size:]].reshape(n, k * k, 3)
+    rgb[r, col] = np.round(sample_rgb.mean(axis=1)).astype(np.uint8)
+
+    return rgb, n / nu.size
+
+
+def render_antialiased(width=1200, height=900, xlim=(-2.5, 1.0), ylim=(-1.25, 1.25),
+                       formula="mandelbrot", c=None, max_iter=500, samples=4, threshold=1.0,
+                       cmap_name="plasma", mode="log", workers=1):
+    """escape_time() followed by antialias(); returns (PIL image, fraction refined)."""
+    nu = escape_time(width, height, xlim, ylim, formula=formula, c=c, max_iter=max_iter,
+                     workers=workers)
+    rgb, fraction = antialias(nu, xlim, ylim, formula, c, max_iter, samples, threshold,
+                              cmap_name, mode)
+    return Image.fromarray(rgb, mode="RGB"), fraction
+
+
+if __name__ == "__main__":
+    os.makedirs(OUT_DIR, exist_ok=True)
+    for samples in (4, 16):
+        start = time.perf_counter()
+        img, fraction = render_antialiased(samples=samples)
+        print(f"{samples} samples: {fraction:.1%} of the pixels refined, "
+              f"{time.perf_counter() - start:.2f} s")
+        path = os.path.join(OUT_DIR, f"mandelbrot_aa{samples}.png")
+        img.save(path)
+        print("Saved:", path)
@@ -0,0 +1,110 @@
+"""
+benchmark.py
+Time the fractal renderers on the views used by the scripts.
+
+Usage:
+    python benchmark.py            # full size (1600x1200, 800 iterations)
+    python benchmark.py --size 0.25
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from antialias import antialias
+from escape_time import VIEWS, escape_time
+from ifs import chaos_game, ifs_density, ifs_probabilities, transforms
+from julia import julia
+from mandelbrot import mandelbrot, mandelbrot_distance, normalize_to_image
+from palette import get_palette
+
+
+def timed(label, fn, *args, repeat=1, **kwargs):
+    """Run fn `repeat` times, print the best wall time and return the last result."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(*args, **kwargs)
+        best = min(best, time.perf_counter() - t0)
+    print(f"{label:<48}{best * 1000:>10.1f} ms")
+    return result
+
+
+def import_time(module):
+    """
+    Seconds to import `module` and to build its first palette, each measured
+    in a fresh interpreter (already loaded modules would hide the cost).
+    """
+    script = (
+        "import time\n"
+        "t0 = time.perf_counter()\n"
+        f"import {module}\n"
+        "t1 = time.perf_counter()\n"
+        "from palette import get_palette\n"
+        "get_palette()\n"
+        "print(t1 - t0, time.perf_counter() - t1)\n"
+    )
+    out = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True,
+                         cwd=os.path.dirname(os.path.abspath(__file__)))
+    return [float(v) for v in out.stdout.split()]
+
+
+def run(size=1.0, max_iter=800, repeat=1):
+    width, height = int(1600 * size), int(1200 * size)
+    for module in ("mandelbrot", "julia"):
+        startup, first_palette = import_time(module)
+        print(f"{'import ' + module:<48}{startup * 1000:>10.1f} ms")
+        print(f"{'  first colormap (loads matplotlib)':<48}{first_palette * 1000:>10.1f} ms")
+
+    print(f"Size {width}x{height}, max_iter {max_iter}")
+
+    arr = timed("mandelbrot", mandelbrot, width=width, height=height, max_iter=max_iter, repeat=repeat)
+    for mode in ("log", "histogram"):
+        get_palette(mode=mode)  # table sampling is reported with the import times
+        timed(f"normalize_to_image ({mode} palette)", normalize_to_image, arr, mode=mode, repeat=repeat)
+    rgb, fraction = timed("antialias (16 samples)", antialias, arr, (-2.5, 1.0), (-1.25, 1.25),
+                          max_iter=max_iter, samples=16, repeat=repeat)
+    print(f"  refined {fraction:.1%} of the pixels")
+    timed("mandelbrot distance estimate (max_iter 200)", mandelbrot_distance, width=width, height=height,
+          max_iter=200, repeat=repeat)
+    timed("mandelbrot (no symmetry)", mandelbrot, width=width, height=height, max_iter=max_iter,
+          symmetry=False, repeat=repeat)
+    timed("mandelbrot (double precision)", mandelbrot, width=width, height=height, max_iter=max_iter,
+          precision="double", repeat=repeat)
+    timed("julia", julia, width=width, height=height, c=-0.81 + 0.156j, max_iter=max_iter, repeat=repeat)
+    timed("julia (no symmetry)", julia, width=width, height=height, c=-0.81 + 0.156j, max_iter=max_iter,
+          symmetry=False, repeat=repeat)
+    for formula in ("multibrot", "burning_ship", "tricorn"):
+        xlim, ylim = VIEWS[formula]
+        timed(formula, escape_time, width, height, xlim, ylim, formula=formula, max_iter=max_iter,
+              repeat=repeat)
+
+    timed("mandelbrot periodicity", mandelbrot, width=width, height=height, max_iter=max_iter,
+          periodicity=True, repeat=repeat)
+    # stats accumulate across calls, so they come from one separate untimed run
+    stats = {}
+    mandelbrot(width=width, height=height, max_iter=max_iter, periodicity=True, stats=stats)
+    print(f"  periodic points: {stats['periodic_points']}, iterations saved: {stats['iterations_saved']}")
+
+    n_points = int(20_000_000 * size)
+    timed(f"ifs chaos game ({n_points} points)", lambda: sum(xs.size for xs, _ in
+          chaos_game(transforms, ifs_probabilities(transforms), n_points)), repeat=repeat)
+    timed(f"ifs density ({n_points} points)", ifs_density, transforms,
+          ifs_probabilities(transforms), n_points, repeat=repeat)
+
+    # at least two workers: workers=1 takes the untiled path and would not use a pool
+    workers = max(os.cpu_count() or 1, 2)
+    for executor in ("process", "thread"):
+        timed(f"mandelbrot tiled ({executor} x{workers})", mandelbrot, width=width, height=height,
+              max_iter=max_iter, workers=workers, executor=executor, repeat=repeat)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the escape-time renderers.")
+    parser.add_argument("--size", type=float, default=1.0, help="fraction of the 1600x1200 default")
+    parser.add_argument("--max-iter", type=int, default=800)
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+    run(size=args.size, max_iter=args.max_iter, repeat=args.repeat)
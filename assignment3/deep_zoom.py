@@ -0,0 +1,204 @@
+"""
+deep_zoom.py
+Deep Mandelbrot zooms with perturbation theory.
+
+float64 pixel coordinates stop being distinct below a pixel spacing of
+about 1e-16 relative to the center, so mandelbrot() turns blocky near
+1e-13. Here only one reference orbit Z_n (the view center) is computed
+in high precision with `decimal`; every pixel c = C + dc iterates its
+small difference dz_n = z_n - Z_n in float64:
+
+    dz_{n+1} = 2 Z_n dz_n + dz_n^2 + dc
+
+The deltas are tiny but float64 keeps full relative precision for them
+(down to ~1e-300). When a pixel's orbit gets closer to 0 than to the
+reference (|Z_m + dz| < |dz|) the delta loses precision, which shows up
+as glitches; such pixels are rebased onto the start of the reference
+orbit (dz = z, m = 0), which also covers a reference that escapes early.
+
+check_deep_zoom() compares sampled pixels against a direct decimal
+iteration of the same points, near a boundary point found by bisection.
+
+Usage:
+    python deep_zoom.py
+    python deep_zoom.py --check
+"""
+
+import argparse
+import os
+import decimal
+from decimal import Decimal
+
+import numpy as np
+
+from escape_time import OUT_DIR, normalize_to_image, smooth_iterations
+
+
+def reference_orbit(center_re, center_im, max_iter, digits=50):
+    """
+    High-precision orbit of the center point, rounded to complex128.
+    Stops once |Z| > 2 (rebasing handles pixels that outlive it).
+    """
+    orbit = [0j]
+    # every operation, including 2 * zr, must round to `digits`, not the default 28
+    with decimal.localcontext(decimal.Context(prec=digits)):
+        cr, ci = Decimal(center_re), Decimal(center_im)
+        zr, zi = Decimal(0), Decimal(0)
+        for _ in range(max_iter):
+            zr, zi = zr * zr - zi * zi + cr, 2 * zr * zi + ci
+            orbit.append(complex(float(zr), float(zi)))
+            if zr * zr + zi * zi > 4:
+                break
+    return np.array(orbit, dtype=np.complex128)
+
+
+def decimal_escape(c_re, c_im, max_iter, digits=150):
+    """(escape iteration, |z|^2) of c iterated directly in decimal; iteration 0 if it never escapes."""
+    with decimal.localcontext(decimal.Context(prec=digits)):
+        cr, ci = Decimal(c_re), Decimal(c_im)
+        zr, zi = Decimal(0), Decimal(0)
+        for k in range(1, max_iter + 1):
+            zr, zi = zr * zr - zi * zi + cr, 2 * zr * zi + ci
+            m = zr * zr + zi * zi
+            if m > 4:
+                return k, float(m)
+    return 0, 0.0
+
+
+def deep_mandelbrot(center=("-0.75", "0.1"), radius="1e-3", width=800, height=600,
+                    max_iter=2000, stats=None):
+    """
+    Smooth iteration values of the view centered at `center` (decimal strings)
+    whose imaginary extent is [-radius, radius] around it (radius may be a
+    string such as "1e-120"). The grid matches mandelbrot(): rows go from
+    the lower to the upper imaginary bound.
+
+    If `stats` is a dict it receives the reference orbit length and the
+    number of glitch rebases.
+    """
+    radius = Decimal(radius)
+    spacing = float(2 * radius / (height - 1))
+    # enough digits to resolve single pixels, plus headroom for the orbit
+    digits = max(30, int(-np.floor(np.log10(spacing))) + 20)
+    orbit = reference_orbit(center[0], center[1], max_iter, digits)
+    last = len(orbit) - 1
+
+    # pixel offsets from the center, in float64
+    dx = (np.arange(width) - (width - 1) / 2) * spacing
+    dy = (np.arange(height) - (height - 1) / 2) * spacing
+    dc = (dx[np.newaxis, :] + 1j * dy[:, np.newaxis]).ravel()
+
+    escaped_at = np.zeros(dc.shape, dtype=np.int32)
+    mag2 = np.zeros(dc.shape, dtype=np.float64)
+
+    # compacted state of the active pixels: delta, offset and reference index
+    active = np.arange(dc.size)
+    dz = np.zeros_like(dc)
+    ref_index = np.zeros(dc.shape, dtype=np.intp)
+    rebases = 0
+
+    for k in range(1, max_iter + 1):
+        if active.size == 0:
+            break
+        Zm = orbit[ref_index]
+        dz = (2 * Zm + dz) * dz + dc
+        ref_index += 1
+        z = orbit[ref_index] + dz
+        m = z.real * z.real + z.imag * z.imag
+
+        escaped = m > 4.0
+        if escaped.any():
+            escaped_at[active[escaped]] = k
+            mag2[active[escaped]] = m[escaped]
+            keep = ~escaped
+            active, dz, dc, ref_index, z, m = (
+                active[keep], dz[keep], dc[keep], ref_index[keep], z[keep], m[keep]
+            )
+
+        # glitch detection: |z| < |dz| (or reference exhausted) -> rebase to Z_0 = 0
+        rebase = (m < dz.real * dz.real + dz.imag * dz.imag) | (ref_index >= last)
+        if rebase.any():
+            dz[rebase] = z[rebase]
+            ref_index[rebase] = 0
+            rebases += int(rebase.sum())
+
+    if stats is not None:
+        stats["reference_length"] = len(orbit)
+        stats["rebases"] = rebases
+
+    return smooth_iterations(escaped_at.reshape(height, width), mag2.reshape(height, width), max_iter)
+
+
+def boundary_point(re="0.3", im_inside="0.4", im_outside="0.6", digits=60, max_iter=4000):
+    """
+    Point on the set boundary on the vertical line Re c = re, bisected
+    between an interior and an exterior point to `digits` digits.
+    Returns (re, im) as decimal strings.
+    """
+    with decimal.localcontext(decimal.Context(prec=digits + 10)):
+        lo, hi = Decimal(im_inside), Decimal(im_outside)
+        tolerance = Decimal(10) ** -digits
+        while abs(hi - lo) > tolerance:
+            mid = (lo + hi) / 2
+            if decimal_escape(re, mid, max_iter, digits + 10)[0] == 0:
+                lo = mid
+            else:
+                hi = mid
+    return re, str(hi)
+
+
+def check_deep_zoom(center=None, radius="1e-30", width=64, height=48, max_iter=4000, samples=24,
+                    digits=150, seed=0):
+    """
+    Compare deep_mandelbrot() with decimal_escape() on `samples` random
+    pixels of a view of `radius` around a boundary point (default: found
+    with boundary_point()). Returns the number of pixels whose smooth values
+    differ by more than 1e-3, i.e. that escape at a different iteration.
+    """
+    if center is None:
+        center = boundary_point(max_iter=max_iter)
+    nu = deep_mandelbrot(center, radius, width, height, max_iter)
+
+    # same pixel offsets as deep_mandelbrot(); Decimal(float) is exact
+    spacing = float(2 * Decimal(radius) / (height - 1))
+    rng = np.random.default_rng(seed)
+    mismatches = 0
+    for i in rng.choice(width * height, samples, replace=False):
+        row, col = divmod(int(i), width)
+        dx = (col - (width - 1) / 2) * spacing
+        dy = (row - (height - 1) / 2) * spacing
+        with decimal.localcontext(decimal.Context(prec=digits)):
+            c_re, c_im = Decimal(center[0]) + Decimal(dx), Decimal(center[1]) + Decimal(dy)
+        k, m = decimal_escape(c_re, c_im, max_iter, digits)
+        expected = smooth_iterations(np.array([k]), np.array([m]), max_iter)[0]
+        mismatches += abs(nu[row, col] - expected) > 1e-3
+    return int(mismatches)
+
+
+def save_deep_zoom(path=None, center=("0", "1"), radius="1e-50", width=800, height=600,
+                   max_iter=2000, cmap_name="plasma"):
+    """Default view: 1e-50 around the Misiurewicz point c = i (detail at every scale)."""
+    if path is None:
+        os.makedirs(OUT_DIR, exist_ok=True)
+        path = os.path.join(OUT_DIR, f"deep_zoom_{radius}.png")
+
+    print("Computing deep zoom: radius", radius, "size", width, "x", height, "max_iter", max_iter)
+    stats = {}
+    arr = deep_mandelbrot(center, radius, width, height, max_iter, stats=stats)
+    print("Reference orbit length", stats["reference_length"], "- rebases", stats["rebases"])
+    img = normalize_to_image(arr, cmap_name=cmap_name)
+    img.save(path)
+    print("Saved:", path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render a deep Mandelbrot zoom.")
+    parser.add_argument("--check", action="store_true",
+                        help="compare sampled pixels against direct decimal iteration instead")
+    args = parser.parse_args()
+
+    if args.check:
+        for radius in ("1e-20", "1e-30", "1e-35"):
+            print(f"radius {radius}: {check_deep_zoom(radius=radius)} of 24 pixels differ")
+    else:
+        save_deep_zoom()
@@ -0,0 +1,571 @@
+"""
+escape_time.py
+One escape-time engine for the Mandelbrot set, Julia sets and their variants.
+
+A fractal type is a Formula: the step z -> f(z, c) plus the degree used
+for smooth coloring and an optional analytic interior test. All formulas
+share the compacted iteration loop, the periodicity check, smoothing,
+tiling and coloring, so every optimization applies to each of them.
+
+Parameter plane (c = None): every point is a value of c, z starts at 0.
+Dynamic plane (c given):    every point is a starting z, c is fixed (Julia sets).
+
+Formulas:
+    "mandelbrot"    z^2 + c               (cardioid / period-2 bulb shortcut)
+    "julia"         z^2 + c, c required
+    "multibrot"     z^d + c               (degree d, default 3)
+    "burning_ship"  (|Re z| + i |Im z|)^2 + c
+    "tricorn"       conj(z)^2 + c
+
+Usage:
+    python escape_time.py
+"""
+
+import os
+import numpy as np
+from PIL import Image
+
+from palette import get_palette
+from tiling import render_tiled
+
+OUT_DIR = "out"
+
+# single precision is used while the pixel spacing is at least this
+# fraction of the coordinate scale (about 800 float32 ulps)
+SINGLE_MIN_SPACING = 1e-4
+# in the dynamic plane the rounding error of z itself is amplified along the
+# orbit, so single precision is only used for this many iterations or fewer
+SINGLE_MAX_ITER_DYNAMIC = 100
+
+
+def cardioid_or_bulb(C):
+    """
+    Boolean mask of points inside the main cardioid or the period-2 bulb.
+
+    Both regions belong to the set and can be tested analytically:
+        cardioid: q (q + (x - 1/4)) <= y^2 / 4,  q = (x - 1/4)^2 + y^2
+        bulb:     (x + 1)^2 + y^2 <= 1/16
+    """
+    x, y = np.real(C), np.imag(C)
+    y2 = y * y
+    q = (x - 0.25) ** 2 + y2
+    cardioid = q * (q + (x - 0.25)) <= 0.25 * y2
+    bulb = (x + 1.0) ** 2 + y2 <= 0.0625
+    return cardioid | bulb
+
+
+def _quadratic(z, c, degree):
+    np.multiply(z, z, out=z)
+    z += c
+    return z
+
+
+def _power(z, c, degree):
+    if float(degree).is_integer() and degree >= 2:
+        w = z.copy()
+        for _ in range(int(degree) - 1):
+            w *= z
+    else:
+        w = z ** degree
+    w += c
+    return w
+
+
+def _quadratic_derivative(z, dz, degree):
+    return 2 * z * dz
+
+
+def _power_derivative(z, dz, degree):
+    if float(degree).is_integer() and degree >= 2:
+        w = dz * degree
+        for _ in range(int(degree) - 1):
+            w *= z
+        return w
+    return degree * z ** (degree - 1) * dz
+
+
+def _burning_ship(z, c, degree):
+    z = np.abs(z.real) + 1j * np.abs(z.imag)
+    np.multiply(z, z, out=z)
+    z += c
+    return z
+
+
+def _tricorn(z, c, degree):
+    np.conjugate(z, out=z)
+    np.multiply(z, z, out=z)
+    z += c
+    return z
+
+
+class Formula:
+    """
+    An iteration rule for the engine.
+
+    step:     step(z, c, degree) -> next z (may update z in place)
+    degree:   growth rate of |z| near infinity, used by the smoothing
+    interior: optional interior(c) -> bool mask of parameter-plane points
+              known to be in the set (they skip the loop)
+    needs_c:  the formula only makes sense in the dynamic plane
+    conjugate_symmetric: the parameter-plane set is mirror-symmetric about
+              the real axis (value(conj c) == value(c))
+    even:     step(-z) == step(z), so Julia sets are point-symmetric about 0
+    derivative: derivative(z, dz, degree) -> f'(z) dz, needed for distance
+              estimation (only for holomorphic steps)
+    single_precision: precision="auto" may use complex64 for parameter-plane
+              views (see grid_dtype)
+    """
+
+    def __init__(self, name, step, degree=2, interior=None, needs_c=False,
+                 conjugate_symmetric=False, even=False, derivative=None,
+                 single_precision=False):
+        self.name = name
+        self.step = step
+        self.degree = degree
+        self.interior = interior
+        self.needs_c = needs_c
+        self.conjugate_symmetric = conjugate_symmetric
+        self.even = even
+        self.derivative = derivative
+        self.single_precision = single_precision
+
+    def with_degree(self, degree):
+        if self.step is not _power:
+            raise ValueError(f"Formula {self.name!r} has a fixed degree of {self.degree}; "
+                             "use 'multibrot' for other degrees")
+        even = float(degree).is_integer() and int(degree) % 2 == 0
+        return Formula(self.name, self.step, degree, None, self.needs_c,
+                       self.conjugate_symmetric, even, self.derivative, self.single_precision)
+
+    def __repr__(self):
+        return f"Formula({self.name!r}, degree={self.degree})"
+
+
+FORMULAS = {
+    "mandelbrot": Formula("mandelbrot", _quadratic, interior=cardioid_or_bulb,
+                          conjugate_symmetric=True, even=True, derivative=_quadratic_derivative,
+                          single_precision=True),
+    "julia": Formula("julia", _quadratic, needs_c=True, even=True, derivative=_quadratic_derivative),
+    "multibrot": Formula("multibrot", _power, degree=3, conjugate_symmetric=True,
+                         derivative=_power_derivative, single_precision=True),
+    # the abs() folding makes large parts of the ship chaotic: ~2% of the
+    # pixels change by more than one iteration in single precision
+    "burning_ship": Formula("burning_ship", _burning_ship, even=True),
+    "tricorn": Formula("tricorn", _tricorn, conjugate_symmetric=True, even=True,
+                       single_precision=True),
+}
+
+
+def get_formula(formula, degree=None):
+    """
+    Formula instance for a name (or an instance), optionally with another
+    degree. Only formulas built on the power step (multibrot) accept one.
+    """
+    if not isinstance(formula, Formula):
+        if formula not in FORMULAS:
+            raise ValueError(f"Unknown formula: {formula}")
+        formula = FORMULAS[formula]
+    if degree is not None and degree != formula.degree:
+        formula = formula.with_degree(degree)
+    return formula
+
+
+def counter_dtype(max_iter):
+    """Narrowest unsigned integer type that holds iteration counts up to max_iter."""
+    return np.min_scalar_type(max_iter)
+
+
+def grid_dtype(xlim, ylim, width, height, precision="auto", formula="mandelbrot",
+               parameter_plane=True, max_iter=500):
+    """
+    Coordinate dtype for a grid: float32 when precision="single", or for
+    "auto" when the pixel spacing is at least SINGLE_MIN_SPACING times the
+    coordinate scale (the larger of the window bounds and the escape radius 2)
+    and either
+      - the grid is the parameter plane and the formula has single_precision set, or
+      - the grid is a dynamic plane (Julia set) and max_iter <= SINGLE_MAX_ITER_DYNAMIC;
+    float64 otherwise.
+    """
+    if precision == "single":
+        return np.float32
+    if precision == "double":
+        return np.float64
+    if precision != "auto":
+        raise ValueError(f"Unknown precision: {precision}")
+    spacing = min(abs(xlim[1] - xlim[0]) / max(width - 1, 1), abs(ylim[1] - ylim[0]) / max(height - 1, 1))
+    scale = max(abs(xlim[0]), abs(xlim[1]), abs(ylim[0]), abs(ylim[1]), 2.0)
+    if spacing < SINGLE_MIN_SPACING * scale:
+        return np.float64
+    if parameter_plane:
+        return np.float32 if get_formula(formula).single_precision else np.float64
+    return np.float32 if max_iter <= SINGLE_MAX_ITER_DYNAMIC else np.float64
+
+
+def escape_counts(points, formula="mandelbrot", c=None, max_iter=500, degree=None,
+                  periodicity=False, tol=1e-10, stats=None):
+    """
+    Iterate `formula` for every point of the complex array `points`.
+
+    Only the points that have not escaped yet are kept in compacted arrays
+    (`active` holds their flat indices), so each iteration costs time
+    proportional to the remaining points instead of the whole grid.
+    Escape is tested on |z|^2 > 4, which avoids the square root.
+    In the parameter plane, points passing the formula's interior test
+    never enter the loop.
+
+    periodicity: Brent-style cycle check. z is saved at iterations 1, 2, 4,
+    8, ... and compared with the current z every iteration; an orbit that
+    returns within `tol` of the saved value is periodic, hence interior, and
+    leaves the loop early. If `stats` is a dict, the number of such points
+    and the iterations they skipped are added to stats["periodic_points"]
+    and stats["iterations_saved"].
+
+    The iteration runs in the precision of `points`: complex64 input stays
+    single precision, anything else is iterated as complex128.
+
+    Returns (escaped_at, mag2): the iteration at which each point escaped
+    (0 = never, in the narrowest unsigned type holding max_iter) and |z|^2
+    at that iteration, both shaped like points.
+    """
+    formula = get_formula(formula, degree)
+    if formula.needs_c and c is None:
+        raise ValueError(f"Formula {formula.name!r} needs a value for c")
+
+    p = np.ravel(points)
+    dtype = np.complex64 if p.dtype == np.complex64 else np.complex128
+    escaped_at = np.zeros(p.shape, dtype=counter_dtype(max_iter))
+    mag2 = np.zeros(p.shape, dtype=np.finfo(dtype).dtype)
+
+    # compacted state of the points still being iterated
+    if c is None:
+        # parameter plane: points known to be interior would run all max_iter steps
+        if formula.interior is not None:
+            active = np.flatnonzero(~formula.interior(p))
+        else:
+            active = np.arange(p.size)
+        c_active = p[active].astype(dtype)
+        z = np.zeros_like(c_active)
+    else:
+        active = np.arange(p.size)
+        c_active = c
+        z = p.astype(dtype)
+    per_point_c = c is None
+
+    saved = z.copy()
+    check_at = 1
+    tol2 = tol * tol
+    if stats is not None:
+        stats.setdefault("periodic_points", 0)
+        stats.setdefault("iterations_saved", 0)
+
+    step, d = formula.step, formula.degree
+    for k in range(1, max_iter + 1):
+        if active.size == 0:
+            break
+        z = step(z, c_active, d)
+        m = z.real * z.real + z.imag * z.imag
+
+        escaped = m > 4.0
+        if escaped.any():
+            escaped_at[active[escaped]] = k
+            mag2[active[escaped]] = m[escaped]
+
+            # drop escaped points from the active set
+            keep = ~escaped
+            active, z, saved = active[keep], z[keep], saved[keep]
+            if per_point_c:
+                c_active = c_active[keep]
+
+        if periodicity:
+            d2 = z - saved
+            periodic = d2.real * d2.real + d2.imag * d2.imag < tol2
+            if periodic.any():
+                if stats is not None:
+                    n = int(periodic.sum())
+                    stats["periodic_points"] += n
+                    stats["iterations_saved"] += n * (max_iter - k)
+                # periodic orbits never escape: leave them marked as interior
+                keep = ~periodic
+                active, z, saved = active[keep], z[keep], saved[keep]
+                if per_point_c:
+                    c_active = c_active[keep]
+            if k == check_at:
+                saved = z.copy()
+                check_at *= 2
+
+    return escaped_at.reshape(np.shape(points)), mag2.reshape(np.shape(points))
+
+
+def smooth_iterations(escaped_at, mag2, max_iter=500, degree=2):
+    """
+    Smooth iteration counts for coloring: nu = n + 1 - log(log|z|)/log(degree)
+    for escaped points (with log|z| = log(|z|^2) / 2), 0 for points in the set.
+    """
+    escaped_mask = (escaped_at > 0) & (escaped_at <= max_iter)
+    nu = np.zeros(escaped_at.shape, dtype=np.float64)
+    # Avoid invalid logs by clipping (|z| <= 1e12)
+    m = np.clip(mag2[escaped_mask], 4.0, 1e24)
+    nu[escaped_mask] = escaped_at[escaped_mask] + 1.0 - np.log(0.5 * np.log(m)) / np.log(degree)
+    return nu
+
+
+def escape_points(points, formula="mandelbrot", c=None, max_iter=500, degree=None,
+                  periodicity=False, stats=None):
+    """Smooth iteration values for an arbitrary array of points."""
+    formula = get_formula(formula, degree)
+    escaped_at, mag2 = escape_counts(points, formula, c, max_iter,
+                                     periodicity=periodicity, stats=stats)
+    return smooth_iterations(escaped_at, mag2, max_iter, formula.degree)
+
+
+def escape_tile(xs, ys, formula="mandelbrot", c=None, max_iter=500, degree=None,
+                periodicity=False, stats=None):
+    """
+    Smooth iteration values for the grid xs (columns) x ys (rows);
+    float32 coordinates are iterated in single precision.
+    """
+    points = xs[np.newaxis, :] + 1j * ys[:, np.newaxis]
+    return escape_points(points, formula, c, max_iter, degree, periodicity, stats)
+
+
+def distance_counts(points, formula="mandelbrot", c=None, max_iter=500, degree=None,
+                    bailout=1000.0):
+    """
+    Exterior distance estimate for every point of `points`.
+
+    Runs the same compacted loop as escape_counts, but also carries the
+    derivative dz of z with respect to the pixel coordinate:
+        parameter plane: dz -> f'(z) dz + 1, dz_0 = 0
+        dynamic plane:   dz -> f'(z) dz,     dz_0 = 1
+    For escaped points the distance to the set is estimated as
+        |z| log|z| / |dz|
+    which needs a large escape radius (`bailout`, instead of 2) to be
+    accurate. Points that never escape get distance 0.
+
+    Returns (escaped_at, distance) shaped like points.
+    """
+    formula = get_formula(formula, degree)
+    if formula.derivative is None:
+        raise ValueError(f"Formula {formula.name!r} has no derivative for distance estimation")
+    if formula.needs_c and c is None:
+        raise ValueError(f"Formula {formula.name!r} needs a value for c")
+
+    p = np.ravel(points)
+    dtype = np.complex64 if p.dtype == np.complex64 else np.complex128
+    escaped_at = np.zeros(p.shape, dtype=counter_dtype(max_iter))
+    distance = np.zeros(p.shape, dtype=np.float64)
+
+    if c is None:
+        if formula.interior is not None:
+            active = np.flatnonzero(~formula.interior(p))
+        else:
+            active = np.arange(p.size)
+        c_active = p[active].astype(dtype)
+        z = np.zeros_like(c_active)
+        dz = np.zeros_like(c_active)
+    else:
+        active = np.arange(p.size)
+        c_active = c
+        z = p.astype(dtype)
+        dz = np.ones_like(z)
+    per_point_c = c is None
+    bailout2 = bailout * bailout
+
+    step, derivative, d = formula.step, formula.derivative, formula.degree
+    for k in range(1, max_iter + 1):
+        if active.size == 0:
+            break
+        # the derivative uses z before the step
+        dz = derivative(z, dz, d)
+        if per_point_c:
+            dz += 1
+        z = step(z, c_active, d)
+        m = z.real * z.real + z.imag * z.imag
+
+        escaped = m > bailout2
+        if escaped.any():
+            ze, dze = z[escaped], dz[escaped]
+            abs_z = np.abs(ze).astype(np.float64)
+            escaped_at[active[escaped]] = k
+            distance[active[escaped]] = abs_z * np.log(abs_z) / np.abs(dze)
+
+            keep = ~escaped
+            active, z, dz = active[keep], z[keep], dz[keep]
+            if per_point_c:
+                c_active = c_active[keep]
+
+    return escaped_at.reshape(np.shape(points)), distance.reshape(np.shape(points))
+
+
+def distance_tile(xs, ys, formula="mandelbrot", c=None, max_iter=500, degree=None, bailout=1000.0):
+    """Distance estimates for the grid xs (columns) x ys (rows)."""
+    points = xs[np.newaxis, :] + 1j * ys[:, np.newaxis]
+    return distance_counts(points, formula, c, max_iter, degree, bailout)[1]
+
+
+def mirror_index(values, tol=1e-6):
+    """
+    For each entry of the ascending coordinate array `values`, the index of
+    the entry equal to its negation (within tol times the spacing, or a few
+    ulps of the coordinate dtype), or -1.
+    """
+    n = len(values)
+    if n < 2 or not np.all(np.diff(values) > 0):
+        return np.full(n, -1)
+    limit = max(tol * abs(values[1] - values[0]),
+                4 * np.finfo(values.dtype).eps * np.abs(values).max())
+    target = -values
+    j = np.clip(np.searchsorted(values, target), 1, n - 1)
+    # nearest of the two neighbours around the insertion point
+    j -= np.abs(values[j - 1] - target) < np.abs(values[j] - target)
+    return np.where(np.abs(values[j] - target) <= limit, j, -1)
+
+
+def render_symmetric(render, xs, ys, row_mirror, col_mirror):
+    """
+    Render the grid xs x ys with render(xs, ys) -> 2D array, computing
+    pixels whose mirror image is also on the grid only once.
+
+    Pixel (r, c) mirrors onto (row_mirror[r], col_mirror[c]); -1 means the
+    row or column has no mirror. Of each mirrored row pair the upper one
+    (larger index) is computed, the other one is copied from it except for
+    the columns without a mirror, which are computed as well.
+    """
+    rows = np.arange(len(ys))
+    copied = np.flatnonzero(row_mirror > rows)
+    if copied.size == 0:
+        return render(xs, ys)
+    own = np.flatnonzero(row_mirror <= rows)  # also rows without a mirror (-1)
+
+    out = np.empty((len(ys), len(xs)), dtype=np.float64)
+    out[own] = render(xs, ys[own])
+    cols = np.flatnonzero(col_mirror >= 0)
+    out[np.ix_(copied, cols)] = out[np.ix_(row_mirror[copied], col_mirror[cols])]
+    rest = np.flatnonzero(col_mirror < 0)
+    if rest.size:
+        out[np.ix_(copied, rest)] = render(xs[rest], ys[copied])
+    return out
+
+
+def escape_time(width=1200, height=900, xlim=(-2.5, 1.0), ylim=(-1.25, 1.25),
+                formula="mandelbrot", c=None, max_iter=500, degree=None, workers=1,
+                executor="process", tile_size=64, periodicity=False, stats=None,
+                symmetry=True, precision="auto"):
+    """
+    Smooth iteration values of `formula` on a width x height grid.
+
+    With workers != 1 the image is rendered in tiles across a process
+    (or thread) pool, see tiling.render_tiled; workers=None uses all cores.
+    periodicity/stats: see escape_counts (stats are only collected when
+    rendering with workers=1).
+
+    symmetry: where the window overlaps its mirror image, only compute one
+    half and copy the other: about the real axis for conjugate-symmetric
+    parameter planes, through the origin for Julia sets of even formulas.
+    Grid rows/columns count as mirrored when they agree to within 1e-6 of
+    the spacing, so a few chaotic boundary pixels can differ from a full
+    render in the last bits of their coordinates.
+
+    precision: "auto" (see grid_dtype), "single" or "double". Single
+    precision halves the memory traffic of the loop; escape counts can then
+    differ on the boundary, where orbits are chaotic.
+    """
+    dtype = grid_dtype(xlim, ylim, width, height, precision, get_formula(formula, degree),
+                       c is None, max_iter)
+    xs = np.linspace(xlim[0], xlim[1], width, dtype=dtype)
+    ys = np.linspace(ylim[0], ylim[1], height, dtype=dtype)
+
+    args = (formula, c, max_iter, degree, periodicity)
+    if workers == 1:
+        args += (stats,)
+    return render_grid(escape_tile, xs, ys, args, get_formula(formula, degree), c is None,
+                       workers, executor, tile_size, symmetry)
+
+
+def render_grid(tile_fn, xs, ys, args, formula, parameter_plane, workers=1, executor="process",
+                tile_size=64, symmetry=True):
+    """
+    Render tile_fn(xs, ys, *args) over the grid in one call (workers=1) or
+    tiled across a pool, computing mirrored parts once when `formula` allows.
+    """
+    if workers == 1:
+        def render(xs, ys):
+            return tile_fn(xs, ys, *args)
+    else:
+        def render(xs, ys):
+            return render_tiled(tile_fn, xs, ys, args=args, tile_size=tile_size,
+                                workers=workers, executor=executor)
+
+    if symmetry and parameter_plane and formula.conjugate_symmetric:
+        return render_symmetric(render, xs, ys, mirror_index(ys), np.arange(len(xs)))
+    if symmetry and not parameter_plane and formula.even:
+        return render_symmetric(render, xs, ys, mirror_index(ys), mirror_index(xs))
+    return render(xs, ys)
+
+
+def distance_estimate(width=1200, height=900, xlim=(-2.5, 1.0), ylim=(-1.25, 1.25),
+                      formula="mandelbrot", c=None, max_iter=500, degree=None, bailout=1000.0,
+                      workers=1, executor="process", tile_size=64, symmetry=True,
+                      precision="auto"):
+    """
+    Per-pixel distance to the set (0 inside) on the same grid as escape_time(),
+    see distance_counts. Color it with distance_to_image.
+    """
+    dtype = grid_dtype(xlim, ylim, width, height, precision, get_formula(formula, degree),
+                       c is None, max_iter)
+    xs = np.linspace(xlim[0], xlim[1], width, dtype=dtype)
+    ys = np.linspace(ylim[0], ylim[1], height, dtype=dtype)
+    return render_grid(distance_tile, xs, ys, (formula, c, max_iter, degree, bailout),
+                       get_formula(formula, degree), c is None, workers, executor, tile_size,
+                       symmetry)
+
+
+def normalize_to_image(arr, cmap_name="plasma", mode="log"):
+    """
+    Convert the float array `arr` into an RGB image.
+    `arr` expected to be non-negative; higher -> brighter/colorful.
+    Values are quantized into a precomputed uint8 palette (see palette.py);
+    the default "log" mode applies logarithmic scaling to emphasize fine details.
+    """
+    rgb = get_palette(cmap_name, mode).apply(arr)
+    return Image.fromarray(rgb, mode="RGB")
+
+
+def distance_to_image(distance, spacing, thickness=1.0, cmap_name="bone"):
+    """
+    Image of a distance estimate: points within `thickness` pixels of the
+    boundary (including the set itself) are dark, the exterior fades to light.
+    `spacing` is the pixel spacing in the complex plane.
+    """
+    t = np.sqrt(np.clip(distance / (thickness * spacing), 0.0, 1.0))
+    rgb = get_palette(cmap_name, "linear").apply(t, 0.0, 1.0)
+    return Image.fromarray(rgb, mode="RGB")
+
+
+# views that show the whole set for the parameter-plane formulas
+VIEWS = {
+    "mandelbrot": ((-2.5, 1.0), (-1.25, 1.25)),
+    "multibrot": ((-1.6, 1.6), (-1.2, 1.2)),
+    "burning_ship": ((-2.5, 1.5), (-2.0, 1.0)),
+    "tricorn": ((-2.1, 1.5), (-1.35, 1.35)),
+}
+
+
+def save_escape_time(formula, path=None, width=1200, height=900, max_iter=500,
+                     cmap_name="plasma", workers=1, executor="process"):
+    if path is None:
+        os.makedirs(OUT_DIR, exist_ok=True)
+        path = os.path.join(OUT_DIR, f"{formula}.png")
+
+    xlim, ylim = VIEWS[formula]
+    print(f"Computing {formula}: size", width, "x", height, "max_iter", max_iter)
+    arr = escape_time(width, height, xlim, ylim, formula=formula, max_iter=max_iter,
+                      workers=workers, executor=executor)
+    img = normalize_to_image(arr, cmap_name=cmap_name)
+    img.save(path)
+    print("Saved:", path)
+
+
+if __name__ == "__main__":
+    for name in ("multibrot", "burning_ship", "tricorn"):
+        save_escape_time(name, workers=None)
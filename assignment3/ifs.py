@@ -3,7 +3,6 @@ from PIL import Image
 import os
 
 OUT_DIR = "out"
-os.makedirs(OUT_DIR, exist_ok=True)
 
 def check_contractive(transforms, tol=1.0):
     """
@@ -24,8 +23,100 @@ def check_contractive(transforms, tol=1.0):
             return False
     return True
 
+def chaos_game(
+    transformations, probabilities, n_points, walkers=8192, burn_in=20, chunk_steps=64, seed=None
+):
+    """
+    Chaos game with many independent walkers advanced in lockstep.
+
+    Every walker picks its own random map at every step, and all walkers
+    are advanced together as array operations: the map indices for a block
+    of `chunk_steps` steps (one per step and walker) are drawn up front and
+    looked up in the cumulative probabilities with np.searchsorted, and the
+    coefficients of the chosen maps are gathered once per block. The first
+    `burn_in` steps (walkers still travelling from the origin to the
+    attractor) are discarded.
+
+    Yields (x, y) arrays of at most chunk_steps * walkers points until
+    n_points points have been produced.
+    """
+    rng = np.random.default_rng(seed)
+    coeffs = np.array(transformations, dtype=np.float64).T  # (6, n_maps)
+    cum_probs = np.cumsum(probabilities)
+    walkers = max(1, min(walkers, n_points))
+    x = np.zeros(walkers)
+    y = np.zeros(walkers)
+
+    remaining = n_points
+    skip = burn_in
+    while remaining > 0:
+        steps = min(chunk_steps, skip + -(-remaining // walkers))
+        # first map with r <= cum_probs[j], as in a linear scan
+        idx = np.searchsorted(cum_probs, rng.random((steps, walkers)), side="left")
+        np.minimum(idx, len(cum_probs) - 1, out=idx)  # rounding: cum_probs[-1] may be < 1
+        a, b, c, d, e, f = coeffs[:, idx]
+
+        xs = np.empty((steps, walkers))
+        ys = np.empty((steps, walkers))
+        for k in range(steps):
+            x, y = a[k] * x + b[k] * y + e[k], c[k] * x + d[k] * y + f[k]
+            xs[k], ys[k] = x, y
+
+        used = min(skip, steps)
+        skip -= used
+        xs, ys = xs[used:].ravel()[:remaining], ys[used:].ravel()[:remaining]
+        remaining -= xs.size
+        if xs.size:
+            yield xs, ys
+
+
+class DensityAccumulator:
+    """
+    Point-density histogram over a fixed window, filled chunk by chunk.
+
+    Each add() maps its points to flat pixel indices (row * width + col,
+    rows flipped so y grows upwards) and counts them with one np.bincount,
+    so points can be streamed from chaos_game() without being stored.
+    Points outside the window are dropped.
+    """
+
+    def __init__(self, width, height, xlim, ylim):
+        self.width, self.height = width, height
+        self.xlim, self.ylim = xlim, ylim
+        self.counts = np.zeros(width * height, dtype=np.int64)
+
+    def add(self, xs, ys):
+        x0, x1 = self.xlim
+        y0, y1 = self.ylim
+        xi = ((xs - x0) / (x1 - x0) * (self.width - 1)).astype(np.intp)
+        yi = ((ys - y0) / (y1 - y0) * (self.height - 1)).astype(np.intp)
+        inside = (xs >= x0) & (xi < self.width) & (ys >= y0) & (yi < self.height)
+        flat = (self.height - 1 - yi[inside]) * self.width + xi[inside]  # flip y-axis
+        self.counts += np.bincount(flat, minlength=self.counts.size)
+
+    def image(self):
+        """Grayscale RGB image of log(1 + count), scaled to the densest pixel."""
+        img = self.counts.reshape(self.height, self.width)
+        img_norm = np.log1p(img) / np.log1p(max(img.max(), 1))
+        rgb = (np.stack([img_norm] * 3, axis=-1) * 255).astype(np.uint8)
+        return Image.fromarray(rgb, mode="RGB")
+
+
+def attractor_bounds(transformations, probabilities, n_points=100_000, margin=0.02, seed=None):
+    """(xlim, ylim) of a short pilot chaos game, widened by `margin` of the extent on each side."""
+    xs, ys = np.concatenate(
+        [np.stack(chunk) for chunk in chaos_game(transformations, probabilities, n_points, seed=seed)],
+        axis=1,
+    )
+    limits = []
+    for v in (xs, ys):
+        pad = margin * (v.max() - v.min())
+        limits.append((v.min() - pad, v.max() + pad))
+    return tuple(limits)
+
+
 def ifs_fractal(
-    transformations, probabilities, n_points=500_000, image_size=(1000, 1000)
+    transformations, probabilities, n_points=500_000, image_size=(1000, 1000), seed=None
 ):
     """
     Generate a 2D IFS fractal using the given affine transformations and probabilities.
@@ -33,36 +124,39 @@ def ifs_fractal(
     probabilities: list of probabilities (must sum to 1)
     """
     width, height = image_size
-    points = np.zeros((n_points, 2), dtype=np.float64)
-    x, y = 0.0, 0.0
+    points = np.empty((n_points, 2), dtype=np.float64)
+    i = 0
+    for xs, ys in chaos_game(transformations, probabilities, n_points, seed=seed):
+        points[i:i + xs.size, 0] = xs
+        points[i:i + xs.size, 1] = ys
+        i += xs.size
 
-    cum_probs = np.cumsum(probabilities)
-    for i in range(n_points):
-        r = np.random.rand()
-        for j, p in enumerate(cum_probs):
-            if r <= p:
-                a, b, c, d, e, f = transformations[j]
-                x, y = a * x + b * y + e, c * x + d * y + f
-                points[i] = (x, y)
-                break
-
-    # normalize to image
+    # the image spans exactly the generated points
     x_vals, y_vals = points[:, 0], points[:, 1]
-    x_norm = (
-        (x_vals - x_vals.min()) / (x_vals.max() - x_vals.min()) * (width - 1)
-    ).astype(int)
-    y_norm = (
-        (y_vals - y_vals.min()) / (y_vals.max() - y_vals.min()) * (height - 1)
-    ).astype(int)
+    density = DensityAccumulator(
+        width, height, (x_vals.min(), x_vals.max()), (y_vals.min(), y_vals.max())
+    )
+    density.add(x_vals, y_vals)
+    return density.image()
 
-    img = np.zeros((height, width), dtype=np.uint32)
-    for xi, yi in zip(x_norm, y_norm):
-        img[height - 1 - yi, xi] += 1  # flip y-axis
 
-    # normalize and convert to RGB
-    img_norm = np.log1p(img) / np.log1p(img.max())
-    rgb = (np.stack([img_norm] * 3, axis=-1) * 255).astype(np.uint8)
-    return Image.fromarray(rgb, mode="RGB")
+def ifs_density(
+    transformations, probabilities, n_points=50_000_000, image_size=(1000, 1000),
+    bounds=None, seed=None
+):
+    """
+    Like ifs_fractal, but every chunk of the chaos game is binned as soon as
+    it is produced, so memory does not grow with n_points. The window is
+    `bounds` = (xlim, ylim), or estimated by attractor_bounds() if not given.
+    """
+    width, height = image_size
+    xlim, ylim = bounds if bounds is not None else attractor_bounds(
+        transformations, probabilities, seed=seed
+    )
+    density = DensityAccumulator(width, height, xlim, ylim)
+    for xs, ys in chaos_game(transformations, probabilities, n_points, seed=seed):
+        density.add(xs, ys)
+    return density.image()
 
 
 def ifs_probabilities(transformations):
@@ -86,6 +180,7 @@ def ifs_probabilities(transformations):
 # ]
 # sierpinski_probs = ifs_probabilities(sierpinski_transforms)
 
+# Barnsley fern
 transforms = [
     (0.00, 0.00, 0.00, 0.16, 0.0, 0.0),    
     (0.85, 0.04, -0.04, 0.85, 0.0, 1.6),   
@@ -93,6 +188,7 @@ transforms = [
     (-0.15, 0.28, 0.26, 0.24, 0.0, 0.44)
 ]
 
-if check_contractive(transforms):
+if __name__ == "__main__" and check_contractive(transforms):
+    os.makedirs(OUT_DIR, exist_ok=True)
     img = ifs_fractal(transforms, ifs_probabilities(transforms))
     img.save(os.path.join(OUT_DIR, "ifs.png"))
@@ -1,94 +1,73 @@
 """
 julia.py
 Generate a Julia set image and save to out/julia.png.
+The iteration itself lives in escape_time.py.
 
 Usage:
     python julia.py
 """
 
 import os
-import numpy as np
-from PIL import Image
-import matplotlib.pyplot as plt
+
+from escape_time import escape_counts, escape_points, escape_tile, escape_time, normalize_to_image
 
 OUT_DIR = "out"
-os.makedirs(OUT_DIR, exist_ok=True)
 
 
-def julia(width=1200, height=900, xlim=(-1.5, 1.5), ylim=(-1.25, 1.25),
-          c=-0.8 + 0.156j, max_iter=500):
-    """
-    Compute Julia set escape-time counts using a vectorized algorithm.
-    Returns a 2D float array of smooth iteration values.
+def julia_counts(Z0, c=-0.8 + 0.156j, max_iter=500, periodicity=False, tol=1e-10, stats=None):
     """
-    xs = np.linspace(xlim[0], xlim[1], width, dtype=np.float64)
-    ys = np.linspace(ylim[0], ylim[1], height, dtype=np.float64)
-    X, Y = np.meshgrid(xs, ys)
-    Z = X + 1j * Y
-
-    escaped_at = np.zeros(Z.shape, dtype=np.int32)
-    absZ = np.abs(Z)
-    not_escaped = np.ones(Z.shape, dtype=bool)
+    Iterate z -> z^2 + c from every starting point in Z0
+    (see escape_time.escape_counts for periodicity/tol/stats).
 
-    for k in range(1, max_iter + 1):
-        Z[not_escaped] = Z[not_escaped] ** 2 + c
-        absZ[not_escaped] = np.abs(Z[not_escaped])
-
-        newly_escaped = not_escaped & (absZ > 2.0)
-        if newly_escaped.any():
-            escaped_at[newly_escaped] = k
-            not_escaped[newly_escaped] = False
+    Returns (escaped_at, mag2) shaped like Z0 (escaped_at == 0: never escaped).
+    """
+    return escape_counts(Z0, "julia", c, max_iter, periodicity=periodicity, tol=tol, stats=stats)
 
-        if not not_escaped.any():
-            break
 
-    escaped_at[escaped_at == 0] = max_iter + 1
+def julia_points(Z0, c=-0.8 + 0.156j, max_iter=500, periodicity=False, stats=None):
+    """Smooth iteration values for an arbitrary array of starting points Z0."""
+    return escape_points(Z0, "julia", c, max_iter, periodicity=periodicity, stats=stats)
 
-    absZ_clip = np.clip(absZ, 1e-12, 1e12)
-    escaped_mask = escaped_at <= max_iter
-    nu = escaped_at.astype(np.float64)
-    nu[escaped_mask] = (
-        escaped_at[escaped_mask]
-        + 1.0
-        - np.log(np.log(absZ_clip[escaped_mask])) / np.log(2)
-    )
-    nu[~escaped_mask] = 0.0
 
-    return nu
+def julia_tile(xs, ys, c=-0.8 + 0.156j, max_iter=500, periodicity=False, stats=None):
+    """Smooth iteration values for the grid xs (columns) x ys (rows)."""
+    return escape_tile(xs, ys, "julia", c, max_iter, periodicity=periodicity, stats=stats)
 
 
-def normalize_to_image(arr, cmap_name):
+def julia(width=1200, height=900, xlim=(-1.5, 1.5), ylim=(-1.25, 1.25),
+          c=-0.8 + 0.156j, max_iter=500, workers=1, executor="process", tile_size=64,
+          periodicity=False, stats=None, symmetry=True, precision="auto"):
     """
-    Convert a 2D float array into an RGB image using matplotlib colormap
-    with logarithmic scaling for better detail.
+    Compute Julia set escape-time counts using a vectorized algorithm.
+    With workers != 1 the tiles are rendered in parallel (see tiling.py).
+    periodicity/stats: see julia_counts (stats only with workers=1).
+    symmetry: compute pixels mirrored through the origin only once.
+    precision: "auto" (double precision unless max_iter <= 100, see
+    escape_time.grid_dtype), "single" or "double".
+    Returns a 2D float array of smooth iteration values.
     """
-    a = arr.astype(np.float64)
-    a_min, a_max = a.min(), a.max()
-    norm = (a - a_min) / (a_max - a_min) if a_max > a_min else np.zeros_like(a)
-    
-    # logarithmic scaling
-    norm = np.log1p(norm * 10) / np.log1p(10)
-
-    cmap = plt.get_cmap(cmap_name)
-    rgb_float = cmap(norm)[..., :3]
-    rgb = (rgb_float * 255).astype(np.uint8)
-    return Image.fromarray(rgb, mode="RGB")
+    return escape_time(width, height, xlim, ylim, formula="julia", c=c, max_iter=max_iter,
+                       workers=workers, executor=executor, tile_size=tile_size,
+                       periodicity=periodicity, stats=stats, symmetry=symmetry,
+                       precision=precision)
 
 
 def save_julia(path=None, width=1600, height=1200, c=-0.81 + 0.156j,
-               max_iter=800, cmap_name="plasma"):
+               max_iter=800, cmap_name="plasma", workers=1, executor="process"):
     # sanitize c for filename
     c_str = f"{c.real:.3f}_{c.imag:.3f}".replace("-", "m").replace(".", "p")
     filename = f"julia_c{c_str}_{cmap_name}.png"
     if path is None:
+        os.makedirs(OUT_DIR, exist_ok=True)
         path = os.path.join(OUT_DIR, filename)
 
     print("Computing Julia set: size", width, "x", height, "max_iter", max_iter, "c =", c)
-    arr = julia(width=width, height=height, c=c, max_iter=max_iter)
+    arr = julia(width=width, height=height, c=c, max_iter=max_iter,
+                workers=workers, executor=executor)
     img = normalize_to_image(arr, cmap_name=cmap_name)
     img.save(path)
     print("Saved:", path)
 
 
 if __name__ == "__main__":
-    save_julia()
+    save_julia(workers=None)
@@ -0,0 +1,166 @@
+"""
+julia_sweep.py
+Render many Julia sets (a path or grid of c values) in one job.
+
+Every frame of a sweep uses the same pixel grid, so it is built once per
+worker process together with the index map of the point symmetry
+(z -> -z): only one half of the pixels is iterated per frame and copied
+into a reused frame buffer. Frames are spread over a process pool and
+either written as numbered PNGs, into a .npy frame stack on disk
+(memory-mapped, written by the workers in place), or returned as an
+in-memory stack.
+
+Usage:
+    python julia_sweep.py --frames 120
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from escape_time import OUT_DIR, escape_points, get_formula, grid_dtype, mirror_index
+from palette import get_palette
+
+
+def circle_path(frames, radius=0.7885, center=0j, turns=1.0):
+    """c values on a circle, c = center + radius * exp(i t) (the classic morph for 0.7885)."""
+    t = np.linspace(0.0, 2 * np.pi * turns, frames, endpoint=False)
+    return center + radius * np.exp(1j * t)
+
+
+def line_path(c0, c1, frames):
+    """c values on the segment from c0 to c1 (both included)."""
+    return np.linspace(complex(c0), complex(c1), frames)
+
+
+def grid_path(re_range, im_range, nx, ny):
+    """(ny, nx) grid of c values, e.g. for a Julia-set atlas of a region of the Mandelbrot set."""
+    re = np.linspace(re_range[0], re_range[1], nx)
+    im = np.linspace(im_range[0], im_range[1], ny)
+    return re[np.newaxis, :] + 1j * im[:, np.newaxis]
+
+
+class SweepGrid:
+    """Pixel grid, symmetry map and frame buffer shared by all frames of a sweep."""
+
+    def __init__(self, width, height, xlim=(-1.5, 1.5), ylim=(-1.25, 1.25), formula="julia",
+                 precision="auto", symmetry=True, max_iter=300):
+        self.width, self.height = width, height
+        self.formula = get_formula(formula)
+        self.max_iter = max_iter
+        dtype = grid_dtype(xlim, ylim, width, height, precision, self.formula, False, max_iter)
+        xs = np.linspace(xlim[0], xlim[1], width, dtype=dtype)
+        ys = np.linspace(ylim[0], ylim[1], height, dtype=dtype)
+        points = (xs[np.newaxis, :] + 1j * ys[:, np.newaxis]).ravel()
+
+        # pixels whose mirror -z is a pixel with a larger row index are copied from it
+        rows, cols = np.arange(height), np.arange(width)
+        copied = np.zeros((height, width), dtype=bool)
+        source = np.zeros((height, width), dtype=np.intp)
+        if symmetry and self.formula.even:
+            row_mirror, col_mirror = mirror_index(ys), mirror_index(xs)
+            copied = (row_mirror > rows)[:, np.newaxis] & (col_mirror >= 0)[np.newaxis, :]
+            source = row_mirror[:, np.newaxis] * width + col_mirror[np.newaxis, :]
+        self.compute = np.flatnonzero(~copied)
+        self.copy_to = np.flatnonzero(copied)
+        self.copy_from = source.ravel()[self.copy_to]
+        self.points = points[self.compute]
+        self.frame = np.empty(height * width, dtype=np.float64)
+
+    def render(self, c):
+        """Smooth iteration values for one c; the returned array is reused by the next call."""
+        self.frame[self.compute] = escape_points(self.points, self.formula, c, self.max_iter)
+        self.frame[self.copy_to] = self.frame[self.copy_from]
+        return self.frame.reshape(self.height, self.width)
+
+
+# per-process state of the pool workers
+_worker = {}
+
+
+def _init_worker(grid_args, frame_pattern, stack_path, cmap_name, mode, vmax):
+    grid = SweepGrid(*grid_args)
+    stack = None
+    if stack_path is not None:
+        # frames are addressed by their flat index, whatever the shape of cs
+        stack = np.load(stack_path, mmap_mode="r+").reshape(-1, grid.height, grid.width)
+    _worker.update(grid=grid, frame_pattern=frame_pattern, stack=stack,
+                   cmap_name=cmap_name, mode=mode, vmax=vmax)
+
+
+def _render_frame(task):
+    """Render frame `index` and store it as configured; returns the frame only without a sink."""
+    index, c = task
+    w = _worker
+    frame = w["grid"].render(c)
+    if w["frame_pattern"] is not None:
+        vmax = frame.max() if w["vmax"] is None else w["vmax"]
+        rgb = get_palette(w["cmap_name"], w["mode"]).apply(frame, 0.0, vmax)
+        Image.fromarray(rgb, mode="RGB").save(w["frame_pattern"].format(index))
+    if w["stack"] is not None:
+        w["stack"][index] = frame
+    if w["frame_pattern"] is None and w["stack"] is None:
+        return frame.astype(np.float32)
+    return None
+
+
+def sweep_julia(cs, width=480, height=360, xlim=(-1.5, 1.5), ylim=(-1.25, 1.25), max_iter=300,
+                formula="julia", workers=None, frame_pattern=None, stack_path=None,
+                cmap_name="plasma", mode="log", vmax=None, precision="auto", chunksize=4):
+    """
+    Render the Julia set of every c in `cs` (any shape; frames are numbered
+    in flat order).
+
+    frame_pattern: write PNGs to frame_pattern.format(index), e.g.
+                   "out/sweep/frame_{:04d}.png"; colors use the range
+                   [0, vmax] (default: each frame's maximum)
+    stack_path:    write float32 values to a .npy stack of shape
+                   cs.shape + (height, width), filled by the workers in place
+    workers:       process count (None = all cores, 1 = in this process)
+
+    Without frame_pattern and stack_path the stack is returned in memory.
+    """
+    cs = np.asarray(cs, dtype=np.complex128)
+    tasks = list(enumerate(cs.ravel()))
+    if stack_path is not None:
+        stack = np.lib.format.open_memmap(stack_path, mode="w+", dtype=np.float32,
+                                          shape=cs.shape + (height, width))
+        del stack  # created here, filled by the workers
+    init_args = ((width, height, xlim, ylim, formula, precision, True, max_iter), frame_pattern,
+                 stack_path, cmap_name, mode, vmax)
+
+    if workers == 1:
+        _init_worker(*init_args)
+        frames = [_render_frame(t) for t in tasks]
+        _worker.clear()
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=init_args) as pool:
+            frames = list(pool.map(_render_frame, tasks, chunksize=chunksize))
+
+    if frame_pattern is None and stack_path is None:
+        return np.stack(frames).reshape(cs.shape + (height, width))
+    return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render a Julia set morph as numbered frames.")
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--width", type=int, default=480)
+    parser.add_argument("--height", type=int, default=360)
+    parser.add_argument("--max-iter", type=int, default=300)
+    parser.add_argument("--workers", type=int, default=0, help="0 = all cores")
+    args = parser.parse_args()
+
+    directory = os.path.join(OUT_DIR, "julia_sweep")
+    os.makedirs(directory, exist_ok=True)
+    start = time.perf_counter()
+    sweep_julia(circle_path(args.frames), args.width, args.height, max_iter=args.max_iter,
+                workers=args.workers or None, frame_pattern=os.path.join(directory, "frame_{:04d}.png"))
+    elapsed = time.perf_counter() - start
+    print(f"{args.frames} frames in {elapsed:.2f} s ({args.frames / elapsed:.1f} frames/s), "
+          f"saved to {directory}")
@@ -0,0 +1,99 @@
+"""
+palette.py
+Color mapping through a precomputed uint8 lookup table.
+
+A matplotlib colormap is sampled once into a 4096-entry RGB table. Mapping
+an image is then a quantization of the values to table indices plus a
+single np.take, instead of evaluating the colormap per pixel into a float
+RGBA array. matplotlib is only imported when the first table is sampled.
+
+Modes:
+    "log"        min-max normalization with logarithmic emphasis of low values
+                 (the curve used by normalize_to_image, baked into the table)
+    "linear"     plain min-max normalization
+    "histogram"  histogram equalization: every color is used by about the same
+                 number of escaped pixels; points in the set (value 0) stay at index 0
+    "cyclic"     the palette repeats every `period` iterations, independent of the
+                 value range, so colors stay stable while zooming
+"""
+
+import numpy as np
+
+LUT_SIZE = 4096
+MODES = ("log", "linear", "histogram", "cyclic")
+
+_palettes = {}
+
+
+def sample_colormap(cmap_name, size=LUT_SIZE, curve=None):
+    """(size, 3) uint8 table of colormap colors at evenly spaced positions (optionally remapped by curve)."""
+    # imported here: matplotlib takes longer to load than the rest of the
+    # scripts together and is only needed the first time a table is built
+    from matplotlib import colormaps
+
+    positions = np.linspace(0.0, 1.0, size)
+    if curve is not None:
+        positions = curve(positions)
+    rgb_float = colormaps[cmap_name](positions)[:, :3]
+    return (rgb_float * 255).astype(np.uint8)
+
+
+def _log_curve(x):
+    return np.log1p(x * 10) / np.log1p(10)
+
+
+class Palette:
+    """A colormap sampled into a uint8 lookup table plus the value-to-index mapping."""
+
+    def __init__(self, cmap_name="plasma", mode="log", size=LUT_SIZE, period=64.0):
+        if mode not in MODES:
+            raise ValueError(f"Unknown palette mode: {mode}")
+        self.cmap_name = cmap_name
+        self.mode = mode
+        self.size = size
+        self.period = period
+        self.lut = sample_colormap(cmap_name, size, _log_curve if mode == "log" else None)
+
+    def indices(self, arr, vmin=None, vmax=None):
+        """
+        Quantize values to table indices (uint16).
+        vmin/vmax fix the normalization range (default: min/max of arr), which
+        keeps colors consistent when an image is mapped in several pieces.
+        """
+        a = np.asarray(arr)
+        n = self.size
+
+        if self.mode == "cyclic":
+            idx = np.mod(a, self.period) * (n / self.period)
+            return np.minimum(idx, n - 1).astype(np.uint16)
+
+        if self.mode == "histogram":
+            escaped = a[a > 0]
+            if escaped.size == 0:
+                return np.zeros(a.shape, dtype=np.uint16)
+            counts, edges = np.histogram(escaped, bins=n)
+            cdf = np.cumsum(counts) / escaped.size
+            bins = np.clip(np.searchsorted(edges, a, side="right") - 1, 0, n - 1)
+            idx = (cdf[bins] * (n - 1)).astype(np.uint16)
+            idx[a <= 0] = 0
+            return idx
+
+        a_min = a.min() if vmin is None else vmin
+        a_max = a.max() if vmax is None else vmax
+        if a_max <= a_min:
+            return np.zeros(a.shape, dtype=np.uint16)
+        idx = (a - a_min) * ((n - 1) / (a_max - a_min))
+        np.clip(idx, 0, n - 1, out=idx)
+        return idx.astype(np.uint16)
+
+    def apply(self, arr, vmin=None, vmax=None):
+        """Map a 2D value array to an (H, W, 3) uint8 RGB array."""
+        return np.take(self.lut, self.indices(arr, vmin, vmax), axis=0)
+
+
+def get_palette(cmap_name="plasma", mode="log", **kwargs):
+    """Shared Palette instance, so each table is only sampled once per process."""
+    key = (cmap_name, mode, tuple(sorted(kwargs.items())))
+    if key not in _palettes:
+        _palettes[key] = Palette(cmap_name, mode, **kwargs)
+    return _palettes[key]
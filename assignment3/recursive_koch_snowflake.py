@@ -3,10 +3,9 @@ import math
 from PIL import Image, ImageDraw
 
 # --------------------------------------------------------
-# Ensure /out directory exists
+# Output directory (created when an image is saved)
 # --------------------------------------------------------
 OUT_DIR = "out"
-os.makedirs(OUT_DIR, exist_ok=True)
 
 
 # --------------------------------------------------------
@@ -93,6 +92,7 @@ def generate_koch_snowflake(depth=4, size=1200):
     draw.line(side2, fill="black", width=1)
     draw.line(side3, fill="black", width=1)
 
+    os.makedirs(OUT_DIR, exist_ok=True)
     output_path = os.path.join(OUT_DIR, f"koch_snowflake_depth_{depth}.png")
     img.save(output_path)
     print("Saved:", output_path)
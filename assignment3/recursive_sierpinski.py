@@ -2,10 +2,9 @@ import os
 from PIL import Image, ImageDraw
 
 # --------------------------------------------------------
-# Utility: ensure /out exists
+# Output directory (created when an image is saved)
 # --------------------------------------------------------
 OUT_DIR = "out"
-os.makedirs(OUT_DIR, exist_ok=True)
 
 
 # --------------------------------------------------------
@@ -51,6 +50,7 @@ def generate_sierpinski(depth=6, size=1000):
 
     sierpinski(draw, depth, p1, p2, p3)
 
+    os.makedirs(OUT_DIR, exist_ok=True)
     output_path = os.path.join(OUT_DIR, f"sierpinski_depth_{depth}.png")
     img.save(output_path)
     print("Saved:", output_path)
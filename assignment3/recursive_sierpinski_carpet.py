@@ -2,10 +2,9 @@ import os
 from PIL import Image, ImageDraw
 
 # --------------------------------------------------------
-# Ensure /out directory exists
+# Output directory (created when an image is saved)
 # --------------------------------------------------------
 OUT_DIR = "out"
-os.makedirs(OUT_DIR, exist_ok=True)
 
 
 # --------------------------------------------------------
@@ -50,6 +49,7 @@ def generate_sierpinski_carpet(depth=4, size=1200):
 
     sierpinski_carpet(draw, 0, 0, size, depth)
 
+    os.makedirs(OUT_DIR, exist_ok=True)
     output_path = os.path.join(OUT_DIR, f"sierpinski_carpet_depth_{depth}.png")
     img.save(output_path)
     print("Saved:", output_path)
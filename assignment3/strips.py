@@ -0,0 +1,187 @@
+"""
+strips.py
+Out-of-core rendering of very large escape-time images.
+
+The image is computed in horizontal strips, so peak memory is bounded by
+the strip size instead of the image size:
+
+1. every strip is iterated and its smooth values are written to a
+   float32 memory-mapped file on disk while the global min/max is tracked;
+2. the strips are read back, colored with the shared palette using that
+   global range (so strips match), and streamed row by row into a PNG.
+
+The PNG is written by PNGWriter, which compresses rows with zlib as they
+arrive, so the RGB image never exists in memory either.
+
+Usage:
+    python strips.py --width 20000 --height 15000
+"""
+
+import argparse
+import os
+import struct
+import tempfile
+import time
+import zlib
+
+import numpy as np
+
+from escape_time import OUT_DIR, VIEWS, escape_tile, grid_dtype
+from palette import get_palette
+from tiling import render_tiled
+
+
+class PNGWriter:
+    """Streaming 8-bit RGB PNG encoder: rows in, compressed IDAT chunks out."""
+
+    def __init__(self, path, width, height, level=6, chunk_size=1 << 20):
+        self.width = width
+        self.height = height
+        self.rows_written = 0
+        self.chunk_size = chunk_size
+        self._file = open(path, "wb")
+        self._compress = zlib.compressobj(level)
+        self._pending = []
+        self._pending_size = 0
+
+        self._file.write(b"\x89PNG\r\n\x1a\n")
+        # 8 bits per channel, color type 2 (RGB), default compression/filter, no interlace
+        self._chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+
+    def _chunk(self, kind, data):
+        self._file.write(struct.pack(">I", len(data)))
+        self._file.write(kind)
+        self._file.write(data)
+        self._file.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(kind)) & 0xFFFFFFFF))
+
+    def _emit(self, data, final=False):
+        if data:
+            self._pending.append(data)
+            self._pending_size += len(data)
+        if self._pending_size >= self.chunk_size or (final and self._pending):
+            self._chunk(b"IDAT", b"".join(self._pending))
+            self._pending, self._pending_size = [], 0
+
+    def write_rows(self, rgb):
+        """Append an (rows, width, 3) uint8 block."""
+        rows = np.ascontiguousarray(rgb, dtype=np.uint8).reshape(len(rgb), self.width * 3)
+        if self.rows_written + len(rows) > self.height:
+            raise ValueError("More rows than the image height")
+        # every scanline starts with its filter type (0 = none)
+        scanlines = np.empty((len(rows), self.width * 3 + 1), dtype=np.uint8)
+        scanlines[:, 0] = 0
+        scanlines[:, 1:] = rows
+        self._emit(self._compress.compress(scanlines.tobytes()))
+        self.rows_written += len(rows)
+
+    def close(self):
+        if self._file.closed:
+            return
+        if self.rows_written != self.height:
+            self._file.close()
+            raise ValueError(f"Wrote {self.rows_written} of {self.height} rows")
+        self._emit(self._compress.flush(), final=True)
+        self._chunk(b"IEND", b"")
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if exc[0] is None:
+            self.close()
+        else:
+            self._file.close()
+
+
+def strip_bounds(height, strip_height):
+    """List of (row0, row1) strips covering `height` rows."""
+    return [(r, min(r + strip_height, height)) for r in range(0, height, strip_height)]
+
+
+def render_strips(path=None, width=20000, height=15000, xlim=(-2.5, 1.0), ylim=(-1.25, 1.25),
+                  formula="mandelbrot", c=None, max_iter=500, strip_height=256,
+                  cmap_name="plasma", mode="log", values_path=None, workers=1,
+                  executor="process", precision="auto", progress=None):
+    """
+    Render a width x height escape-time image strip by strip into a PNG.
+
+    values_path: keep the smooth values as a raw float32 (height, width)
+                 file there (readable with np.memmap); by default a
+                 temporary file is used and deleted afterwards
+    mode:        palette mode; "histogram" is not available because it
+                 needs all values at once
+    progress:    optional progress(stage, rows_done, height) callback
+
+    Returns (vmin, vmax), the value range used for coloring.
+    """
+    if mode == "histogram":
+        raise ValueError("Histogram coloring needs the whole image; use log, linear or cyclic")
+    if path is None:
+        os.makedirs(OUT_DIR, exist_ok=True)
+        path = os.path.join(OUT_DIR, f"{formula}_{width}x{height}.png")
+
+    dtype = grid_dtype(xlim, ylim, width, height, precision, formula, c is None, max_iter)
+    xs = np.linspace(xlim[0], xlim[1], width, dtype=dtype)
+    ys = np.linspace(ylim[0], ylim[1], height, dtype=dtype)
+    strips = strip_bounds(height, strip_height)
+    args = (formula, c, max_iter)
+
+    temporary = values_path is None
+    if temporary:
+        fd, values_path = tempfile.mkstemp(suffix=".f32")
+        os.close(fd)
+    try:
+        values = np.memmap(values_path, dtype=np.float32, mode="w+", shape=(height, width))
+
+        # pass 1: iterate the strips, spill them to disk, track the range
+        vmin, vmax = np.inf, -np.inf
+        for r0, r1 in strips:
+            if workers == 1:
+                strip = escape_tile(xs, ys[r0:r1], *args)
+            else:
+                strip = render_tiled(escape_tile, xs, ys[r0:r1], args=args,
+                                     workers=workers, executor=executor)
+            values[r0:r1] = strip
+            vmin, vmax = min(vmin, strip.min()), max(vmax, strip.max())
+            if progress is not None:
+                progress("iterate", r1, height)
+        values.flush()
+
+        # pass 2: color with the global range and stream rows into the PNG
+        palette = get_palette(cmap_name, mode)
+        with PNGWriter(path, width, height) as png:
+            for r0, r1 in strips:
+                png.write_rows(palette.apply(values[r0:r1], vmin, vmax))
+                if progress is not None:
+                    progress("encode", r1, height)
+        del values
+    finally:
+        if temporary:
+            os.remove(values_path)
+
+    return float(vmin), float(vmax)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render a large escape-time image in strips.")
+    parser.add_argument("--width", type=int, default=20000)
+    parser.add_argument("--height", type=int, default=15000)
+    parser.add_argument("--formula", default="mandelbrot", choices=sorted(VIEWS))
+    parser.add_argument("--max-iter", type=int, default=500)
+    parser.add_argument("--strip-height", type=int, default=256)
+    parser.add_argument("--workers", type=int, default=0, help="0 = all cores")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+
+    def report(stage, done, total):
+        print(f"\r{stage}: {done}/{total} rows ({time.perf_counter() - start:.1f} s)", end="",
+              flush=True)
+        if done == total:
+            print()
+
+    xlim, ylim = VIEWS[args.formula]
+    render_strips(width=args.width, height=args.height, xlim=xlim, ylim=ylim, formula=args.formula,
+                  max_iter=args.max_iter, strip_height=args.strip_height,
+                  workers=args.workers or None, progress=report)
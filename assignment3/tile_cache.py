@@ -0,0 +1,110 @@
+"""
+tile_cache.py
+Persistent on-disk cache of escape-time tiles.
+
+Views are placed on a global pixel lattice: pixel (i, j) sits at
+(i * spacing, j * spacing) in the complex plane. The lattice is cut into
+square tiles, and every computed tile is stored as a .npy file keyed by
+(formula, c, spacing, tile origin, max_iter); any escape_time formula
+name can be cached. Tiles are loaded back
+memory-mapped, so
+
+* recoloring a view (other colormap) needs no iteration at all,
+* panning only computes the tiles that become newly visible.
+
+The least recently used tiles are deleted once the cache holds more than
+`max_tiles` files (file modification time is refreshed on every hit).
+
+Usage:
+    python tile_cache.py
+"""
+
+import hashlib
+import os
+import time
+
+import numpy as np
+
+from escape_time import OUT_DIR, escape_points, normalize_to_image
+
+
+class TileCache:
+    """Directory of memory-mapped escape-time tiles with LRU eviction."""
+
+    def __init__(self, directory=os.path.join(OUT_DIR, "tile_cache"), max_tiles=1024, tile_size=128):
+        self.directory = directory
+        self.max_tiles = max_tiles
+        self.tile_size = tile_size
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def tile_path(self, formula, c, spacing, tx, ty, max_iter):
+        key = repr((formula, complex(c) if c is not None else None, float(spacing),
+                    int(tx), int(ty), int(max_iter), self.tile_size))
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest() + ".npy")
+
+    def get_tile(self, formula, c, spacing, tx, ty, max_iter):
+        """Smooth iteration values of lattice tile (tx, ty), from disk or freshly computed."""
+        path = self.tile_path(formula, c, spacing, tx, ty, max_iter)
+        if os.path.exists(path):
+            self.hits += 1
+            os.utime(path)  # mark as recently used
+            return np.load(path, mmap_mode="r")
+
+        self.misses += 1
+        t = self.tile_size
+        xs = (tx * t + np.arange(t)) * spacing
+        ys = (ty * t + np.arange(t)) * spacing
+        tile = escape_points(xs[np.newaxis, :] + 1j * ys[:, np.newaxis], formula, c, max_iter)
+        np.save(path, tile)
+        self.evict()
+        return tile
+
+    def evict(self):
+        """Delete the least recently used tiles beyond max_tiles."""
+        entries = [e for e in os.scandir(self.directory) if e.name.endswith(".npy")]
+        if len(entries) <= self.max_tiles:
+            return 0
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        stale = entries[:len(entries) - self.max_tiles]
+        for entry in stale:
+            os.remove(entry.path)
+        return len(stale)
+
+    def render(self, formula="mandelbrot", center=(-0.75, 0.0), spacing=0.0025,
+               width=1200, height=900, c=None, max_iter=500):
+        """
+        Smooth iteration values of a width x height view around `center`.
+        The view is snapped to the lattice, rows go from low to high imaginary part.
+        """
+        t = self.tile_size
+        i0 = int(round(center[0] / spacing)) - width // 2
+        j0 = int(round(center[1] / spacing)) - height // 2
+
+        out = np.empty((height, width), dtype=np.float64)
+        for ty in range(j0 // t, (j0 + height - 1) // t + 1):
+            for tx in range(i0 // t, (i0 + width - 1) // t + 1):
+                tile = self.get_tile(formula, c, spacing, tx, ty, max_iter)
+                # overlap of the tile with the view, in lattice coordinates
+                r0, r1 = max(ty * t, j0), min((ty + 1) * t, j0 + height)
+                c0, c1 = max(tx * t, i0), min((tx + 1) * t, i0 + width)
+                out[r0 - j0:r1 - j0, c0 - i0:c1 - i0] = tile[r0 - ty * t:r1 - ty * t, c0 - tx * t:c1 - tx * t]
+        return out
+
+
+if __name__ == "__main__":
+    cache = TileCache()
+
+    def timed_render(label, **kwargs):
+        hits, misses = cache.hits, cache.misses
+        start = time.perf_counter()
+        arr = cache.render(width=1200, height=900, max_iter=500, **kwargs)
+        print(f"{label:<28}{time.perf_counter() - start:8.3f} s  "
+              f"({cache.misses - misses} tiles computed, {cache.hits - hits} from cache)")
+        return arr
+
+    arr = timed_render("first render")
+    arr = timed_render("same view again")
+    normalize_to_image(arr, cmap_name="viridis").save(os.path.join(OUT_DIR, "mandelbrot_cached.png"))
+    timed_render("panned by 200 pixels", center=(-0.75 + 200 * 0.0025, 0.0))
@@ -0,0 +1,85 @@
+"""
+tiling.py
+Parallel tiled rendering for the escape-time fractals.
+
+The image is split into square tiles that are rendered by a pool of worker
+processes (or threads) and written straight into a shared output array.
+Tiles are handed out one at a time, so a worker that finishes a cheap tile
+outside the set immediately picks up the next one while others are still
+busy with expensive tiles on the boundary.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+def tile_bounds(width, height, tile_size=64):
+    """List of (row0, row1, col0, col1) tiles covering a width x height image."""
+    return [
+        (r, min(r + tile_size, height), c, min(c + tile_size, width))
+        for r in range(0, height, tile_size)
+        for c in range(0, width, tile_size)
+    ]
+
+
+def _shared_tile_task(shm_name, shape, tile_fn, xs, ys, tile, args):
+    """Process-pool task: render one tile into the shared-memory output array."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        out = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        r0, r1, c0, c1 = tile
+        out[r0:r1, c0:c1] = tile_fn(xs, ys, *args)
+        del out
+    finally:
+        shm.close()
+    return tile
+
+
+def render_tiled(tile_fn, xs, ys, args=(), tile_size=64, workers=None, executor="process"):
+    """
+    Render the grid xs (columns) x ys (rows) tile by tile.
+
+    tile_fn: module-level function tile_fn(xs_tile, ys_tile, *args) -> 2D float array
+    workers: pool size (default: os.cpu_count())
+    executor: "process" (shared-memory output) or "thread" (NumPy releases the GIL
+              inside the array operations, so threads also scale on large tiles)
+    """
+    height, width = len(ys), len(xs)
+    workers = workers or os.cpu_count() or 1
+    tiles = tile_bounds(width, height, tile_size)
+
+    if executor == "thread":
+        out = np.empty((height, width), dtype=np.float64)
+
+        def run(tile):
+            r0, r1, c0, c1 = tile
+            out[r0:r1, c0:c1] = tile_fn(xs[c0:c1], ys[r0:r1], *args)
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for future in as_completed([pool.submit(run, t) for t in tiles]):
+                future.result()
+        return out
+
+    if executor != "process":
+        raise ValueError(f"Unknown executor: {executor}")
+
+    shape = (height, width)
+    shm = shared_memory.SharedMemory(create=True, size=max(height * width * 8, 1))
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(
+                    _shared_tile_task, shm.name, shape, tile_fn,
+                    xs[c0:c1], ys[r0:r1], (r0, r1, c0, c1), args,
+                )
+                for r0, r1, c0, c1 in tiles
+            ]
+            for future in as_completed(futures):
+                future.result()
+        return np.ndarray(shape, dtype=np.float64, buffer=shm.buf).copy()
+    finally:
+        shm.close()
+        shm.unlink()
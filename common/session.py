@@ -0,0 +1,155 @@
+"""
+Session recording and replay, shared by the assignments.
+
+Every state change of the models goes through a method followed by
+notify(), so wrapping those methods captures the whole session. The
+replayer calls the same methods again, headless or with the GUI attached,
+and times each event including the redraws triggered by notify().
+
+Arguments are stored as JSON. numpy arrays and scalars, lists and tuples
+are handled here; everything model-specific (points, enums, shapes, scene
+nodes) goes through a codec with two functions:
+
+    encode(value) -> JSON-compatible value, or None if not handled
+    decode(value, model) -> value, or None if not handled
+"""
+
+import json
+import time
+import numpy as np
+
+
+def encode_value(value, encode=None):
+    if encode is not None:
+        encoded = encode(value)
+        if encoded is not None:
+            return encoded
+    if isinstance(value, np.ndarray):
+        return {"__ndarray__": value.tolist(), "dtype": str(value.dtype)}
+    if isinstance(value, (list, tuple)):
+        return [encode_value(v, encode) for v in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def decode_value(value, model, decode=None):
+    if isinstance(value, dict):
+        if "__ndarray__" in value:
+            return np.array(value["__ndarray__"], dtype=value["dtype"])
+        if decode is not None:
+            decoded = decode(value, model)
+            if decoded is not None:
+                return decoded
+    if isinstance(value, list):
+        return [decode_value(v, model, decode) for v in value]
+    return value
+
+
+class SessionRecorder:
+    """Wraps the mutating methods of a model and logs each top-level call with a timestamp."""
+
+    def __init__(self, model, methods, encode=None):
+        self.model = model
+        self.encode = encode
+        self.events: list[dict] = []
+        self._originals = {}
+        self._depth = 0  # calls made from inside a recorded call are not logged again
+        self._start = time.perf_counter()
+
+        for name in methods:
+            original = getattr(model, name)
+            self._originals[name] = original
+            setattr(model, name, self._wrap(name, original))
+
+    def _wrap(self, name, original):
+        def recorded(*args, **kwargs):
+            if self._depth == 0:
+                self.events.append({
+                    "t": time.perf_counter() - self._start,
+                    "method": name,
+                    "args": [encode_value(a, self.encode) for a in args],
+                    "kwargs": {k: encode_value(v, self.encode) for k, v in kwargs.items()},
+                })
+            self._depth += 1
+            try:
+                return original(*args, **kwargs)
+            finally:
+                self._depth -= 1
+        return recorded
+
+    def stop(self) -> None:
+        """Restore the original methods."""
+        for name in self._originals:
+            delattr(self.model, name)
+        self._originals.clear()
+
+    def save(self, path: str) -> None:
+        """Write the session as JSON lines (one event per line)."""
+        with open(path, "w") as f:
+            for event in self.events:
+                f.write(json.dumps(event) + "\n")
+
+
+def load_session(path: str) -> list[dict]:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class SessionReplayer:
+    """Re-applies recorded events to a model and measures how long each one takes."""
+
+    def __init__(self, model, events: list[dict], decode=None):
+        self.model = model
+        self.events = events
+        self.decode = decode
+
+    def run(self, realtime: bool = False, flush=None) -> list[dict]:
+        """
+        Replay all events in order.
+
+        realtime: wait between events as in the recording (default: as fast as possible).
+        flush: optional callable run after each event inside the timing, e.g. the
+               Tk root's update_idletasks so deferred drawing is included.
+        Returns one timing record per event.
+        """
+        timings = []
+        start = time.perf_counter()
+        for index, event in enumerate(self.events):
+            if realtime:
+                delay = event["t"] - (time.perf_counter() - start)
+                if delay > 0:
+                    time.sleep(delay)
+
+            # decoded just before the call: scene nodes are looked up in the current model
+            method = getattr(self.model, event["method"])
+            args = [decode_value(a, self.model, self.decode) for a in event["args"]]
+            kwargs = {k: decode_value(v, self.model, self.decode)
+                      for k, v in event.get("kwargs", {}).items()}
+
+            t0 = time.perf_counter()
+            method(*args, **kwargs)
+            if flush is not None:
+                flush()
+            timings.append({
+                "index": index,
+                "method": event["method"],
+                "duration": time.perf_counter() - t0,
+            })
+        return timings
+
+
+def print_timings(timings: list[dict], slowest: int = 5) -> None:
+    """Per-method totals plus the slowest individual events."""
+    by_method: dict[str, list[float]] = {}
+    for t in timings:
+        by_method.setdefault(t["method"], []).append(t["duration"])
+
+    print(f"{'method':<20}{'count':>7}{'total ms':>11}{'mean ms':>10}{'max ms':>10}")
+    for name, durations in sorted(by_method.items(), key=lambda kv: -sum(kv[1])):
+        d = np.array(durations) * 1000
+        print(f"{name:<20}{len(d):>7}{d.sum():>11.2f}{d.mean():>10.2f}{d.max():>10.2f}")
+
+    print("Slowest events:")
+    for t in sorted(timings, key=lambda t: -t["duration"])[:slowest]:
+        print(f"  #{t['index']:<5} {t['method']:<20} {t['duration'] * 1000:.2f} ms")